@@ -10,17 +10,23 @@ import os
 from dataclasses import dataclass
 from dotenv import load_dotenv
 
-# Load environment variables from .env file if it exists
-load_dotenv()
+# Load environment variables from .env file if it exists. Deployments that inject
+# the environment directly can set SKIP_DOTENV=1 to skip the lookup entirely.
+if os.environ.get("SKIP_DOTENV") != "1" and os.path.exists(".env"):
+    load_dotenv(".env", override=False)
 
+# Snapshot of the environment taken once at import (after .env is applied);
+# environment variables do not change for the lifetime of the process
+_ENV = dict(os.environ)
 
-@dataclass
+
+@dataclass(frozen=True)
 class Settings:
     """
     Centralized configuration settings for the Agentic RAG system.
     
     All settings can be overridden via environment variables. Default values
-    are provided for local development.
+    are provided for local development. Instances are immutable.
     
     Attributes:
         ollama_host: Base URL for Ollama API (default: http://localhost:11434)
@@ -29,25 +35,43 @@ class Settings:
         agent_temperature: Temperature setting for LLM generation (0.0-1.0)
         data_dir: Directory path where Excel files are stored
         duckdb_path: Path to DuckDB database file (use :memory: for in-memory DB)
+        llm_cache_path: Path to the SQLite LLM response cache (empty disables caching)
+        llm_cache_redis_url: Redis URL for a shared LLM response cache (overrides llm_cache_path)
+        answer_cache_dir: Directory of the on-disk cache of final answers (empty disables it)
+        answer_cache_size_mb: Size limit of the answer cache in megabytes
+        subquery_cache_dir: Directory of the on-disk cache of sub-question queries and results (empty disables it)
+        subquery_cache_size_mb: Size limit of the sub-question cache in megabytes
     """
     # Ollama connection settings
-    ollama_host: str = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+    ollama_host: str = _ENV.get("OLLAMA_HOST", "http://localhost:11434")
     
     # Model names (must be pulled locally via `ollama pull <model>`)
-    supervisor_model: str = os.getenv("OLLAMA_SUPERVISOR_MODEL", "ministral3:8b")
-    coder_model: str = os.getenv("OLLAMA_CODER_MODEL", "gpt-oss:120b-cloud")
+    supervisor_model: str = _ENV.get("OLLAMA_SUPERVISOR_MODEL", "ministral3:8b")
+    coder_model: str = _ENV.get("OLLAMA_CODER_MODEL", "gpt-oss:120b-cloud")
     
     # Agent configuration
-    agent_temperature: float = float(os.getenv("AGENT_TEMPERATURE", "0.1"))
+    agent_temperature: float = float(_ENV.get("AGENT_TEMPERATURE", "0.1"))
+    
+    # LLM response cache (set LLM_CACHE_PATH to an empty string to disable)
+    llm_cache_path: str = _ENV.get("LLM_CACHE_PATH", "./.langchain_cache.db")
+    llm_cache_redis_url: str = _ENV.get("LLM_CACHE_REDIS_URL", "")
+    
+    # Final-answer cache keyed by (question, schema, models); empty string disables it
+    answer_cache_dir: str = _ENV.get("ANSWER_CACHE_DIR", "./.agentic_cache")
+    answer_cache_size_mb: int = int(_ENV.get("ANSWER_CACHE_SIZE_MB", "256"))
+    
+    # Sub-question (query, results) cache keyed by (sub-question, schema); empty string disables it
+    subquery_cache_dir: str = _ENV.get("SUBQUERY_CACHE_DIR", "./.agentic_subquery_cache")
+    subquery_cache_size_mb: int = int(_ENV.get("SUBQUERY_CACHE_SIZE_MB", "512"))
     
     # Data and database configuration
-    data_dir: str = os.getenv("DATA_DIR", "./data")
-    duckdb_path: str = os.getenv("DUCKDB_PATH", "./duckdb.db")
-    schema_path: str = os.getenv("SCHEMA_PATH", "./schema.json")
+    data_dir: str = _ENV.get("DATA_DIR", "./data")
+    duckdb_path: str = _ENV.get("DUCKDB_PATH", "./duckdb.db")
+    schema_path: str = _ENV.get("SCHEMA_PATH", "./schema.json")
     
     # Memory/checkpoint configuration
-    memory_db_path: str = os.getenv("MEMORY_DB_PATH", "./memory.db")
-    use_postgres_memory: bool = os.getenv("USE_POSTGRES_MEMORY", "false").lower() == "true"
+    memory_db_path: str = _ENV.get("MEMORY_DB_PATH", "./memory.db")
+    use_postgres_memory: bool = _ENV.get("USE_POSTGRES_MEMORY", "false").lower() == "true"
 
 
 # Global settings instance - imported by other modules
@@ -8,14 +8,180 @@ This module defines two specialized agents:
 Both agents use Ollama LLMs via LangChain's ChatOllama interface.
 """
 
+import asyncio
+import json
+import logging
+import re
+import threading
+import weakref
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Callable, Coroutine, Dict, List, Optional, TypeVar
 
+import orjson
 from langchain_ollama import ChatOllama
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.globals import set_llm_cache
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
 
 from config import settings
 
+logger = logging.getLogger("agentic.agents")
+
+# Set once the LLM cache has been installed (see configure_llm_cache)
+_llm_cache_configured = False
+_llm_cache_lock = threading.Lock()
+
+
+def configure_llm_cache() -> None:
+    """
+    Install a process-wide LangChain cache for all ChatOllama calls.
+    
+    Identical (system, human) message pairs sent to the same model with the
+    same parameters are answered from the cache instead of re-hitting Ollama.
+    A Redis cache is used when LLM_CACHE_REDIS_URL is set (shared between
+    processes), otherwise a local SQLite cache at LLM_CACHE_PATH.
+    Setting LLM_CACHE_PATH to an empty string disables caching.
+    
+    Called by the agents when they build their first ChatOllama client, so
+    importing this module never creates the cache file. Later calls are no-ops.
+    """
+    global _llm_cache_configured
+    with _llm_cache_lock:
+        if _llm_cache_configured:
+            return
+        _llm_cache_configured = True
+        try:
+            if settings.llm_cache_redis_url:
+                import redis
+                from langchain_community.cache import RedisCache
+                
+                set_llm_cache(RedisCache(redis.Redis.from_url(settings.llm_cache_redis_url)))
+            elif settings.llm_cache_path:
+                from langchain_community.cache import SQLiteCache
+                
+                set_llm_cache(SQLiteCache(database_path=settings.llm_cache_path))
+        except ImportError as e:
+            logger.warning("LLM cache backend not available (%s). Caching disabled.", e)
+
+T = TypeVar("T")
+
+# Long-lived event loop (on a daemon thread) used by run_sync
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_loop_lock = threading.Lock()
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run an agent coroutine to completion from synchronous code.
+    
+    All synchronous callers share one background event loop. ChatOllama's
+    async HTTP client is bound to the loop it first ran on, so spinning up a
+    fresh loop per call (asyncio.run) would leave its pooled connections
+    attached to a closed loop.
+    
+    Args:
+        coro: Coroutine to run (must not itself call run_sync)
+        
+    Returns:
+        The coroutine's result
+    """
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(target=_sync_loop.run_forever, name="agent-sync-loop", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _sync_loop).result()
+
+
+# Markdown code fence (```json / ```sql / ```) wrapping an LLM response
+_FENCE_RE = re.compile(r"^\s*```(?:json|sql)?\s*\n?(.*?)\n?\s*```\s*$", re.DOTALL)
+
+# Control characters that break JSON parsing
+_CTRL_RE = re.compile(r"[\x00-\x1f\x7f-\x9f]")
+
+# Guidance appended whenever the coding agent must repair a failed query
+_FIX_INSTRUCTIONS = """
+IMPORTANT FIX INSTRUCTIONS:
+1. The error says a column does NOT EXIST in that table. DO NOT USE THAT COLUMN.
+2. Check the "Detected Relationships" section to find the CORRECT join columns.
+3. If the tables you're joining don't share the column you used, find the column they DO share.
+4. Consider: maybe you don't need a JOIN at all? Check if all needed columns are in ONE table.
+5. Look at the relationship: "requests and trip_forms are linked by: trip_form_id" - use trip_form_id NOT request_id.
+"""
+
+
+@lru_cache(maxsize=8)
+def _schema_message(schema_info: str) -> SystemMessage:
+    """
+    Build the schema system message that opens every agent prompt.
+    
+    The schema summary is the same multi-kB string for every question in a
+    session. Sending it as the first message, byte-identical across all agent
+    calls, gives every prompt to a model the same leading tokens, so Ollama
+    reuses the cached prompt evaluation instead of re-processing the schema.
+    The message is built once per distinct schema.
+    
+    Args:
+        schema_info: Human-readable schema description
+        
+    Returns:
+        System message containing the schema
+    """
+    return SystemMessage(content=f"Schema information:\n{schema_info}\n")
+
+
+def _strip_fence(content: str) -> str:
+    """
+    Remove a markdown code fence wrapping an LLM response, if present.
+    
+    Args:
+        content: Raw LLM response content
+        
+    Returns:
+        Inner content of the fence (or the content itself), stripped
+    """
+    match = _FENCE_RE.match(content)
+    return (match.group(1) if match else content).strip()
+
+
+def _normalize_sub_questions(raw: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Coerce LLM-produced sub-questions into {"id", "text", "deps"} dicts.
+    
+    Plain strings (the older flat format) become independent sub-questions.
+    Missing or duplicate ids are replaced by the 1-based position, and
+    dependencies on unknown ids or on the sub-question itself are dropped.
+    
+    Args:
+        raw: "sub_questions" value from the complexity JSON
+        
+    Returns:
+        List of normalized sub-question dictionaries
+    """
+    sub_questions: List[Dict[str, Any]] = []
+    seen: set = set()
+    for pos, item in enumerate(raw, 1):
+        if isinstance(item, dict):
+            text = str(item.get("text") or item.get("question") or "").strip()
+            sq_id = item.get("id", pos)
+            deps = item.get("deps") or []
+        else:
+            text, sq_id, deps = str(item).strip(), pos, []
+        if not text:
+            continue
+        if not isinstance(sq_id, (int, str)) or sq_id in seen:
+            sq_id = pos
+        seen.add(sq_id)
+        sub_questions.append({
+            "id": sq_id,
+            "text": text,
+            "deps": list(deps) if isinstance(deps, list) else [deps],
+        })
+    
+    for sq in sub_questions:
+        sq["deps"] = [d for d in sq["deps"] if d in seen and d != sq["id"]]
+    return sub_questions
+
 
 @dataclass
 class AgentConfig:
@@ -31,6 +197,10 @@ class AgentConfig:
     model: str
     temperature: float
 
+    def signature(self) -> str:
+        """Identify the model setup whose output this config produces."""
+        return f"{self.model}@{self.temperature}"
+
 
 def build_supervisor_config() -> AgentConfig:
     """
@@ -80,7 +250,63 @@ def format_agent_context(schema_summary: str, question: str) -> Dict[str, Any]:
     }
 
 
-class SupervisorAgent:
+class _OllamaAgent:
+    """Base class of the agents: holds the config and the lazily built ChatOllama client."""
+
+    def __init__(self, config: AgentConfig) -> None:
+        """
+        Store the agent configuration.
+        
+        Args:
+            config: AgentConfig with model and connection settings
+        """
+        # ChatOllama clients are built lazily on first use (see _get_llm)
+        self._config = config
+        self._llm: Optional[ChatOllama] = None
+        self._loop_llms: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, ChatOllama]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _get_llm(self) -> ChatOllama:
+        """
+        Return the ChatOllama client for the current event loop, creating it on first use.
+        
+        Deferring construction keeps agent instantiation cheap and surfaces
+        Ollama configuration problems when the agent is actually invoked.
+        ChatOllama's async HTTP client is bound to the loop it first runs on,
+        so each event loop (run_sync's background loop, or the caller's loop
+        under AgenticGraph.arun) gets its own client; calls made outside any
+        loop share one.
+        
+        Returns:
+            ChatOllama instance for this agent and event loop
+        """
+        try:
+            loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        
+        llm = self._llm if loop is None else self._loop_llms.get(loop)
+        if llm is None:
+            configure_llm_cache()
+            try:
+                llm = ChatOllama(
+                    base_url=self._config.host,
+                    model=self._config.model,
+                    temperature=self._config.temperature,
+                )
+            except Exception as e:
+                raise RuntimeError(
+                    f"Failed to initialize Ollama model '{self._config.model}' at {self._config.host}: {e}"
+                ) from e
+            if loop is None:
+                self._llm = llm
+            else:
+                self._loop_llms[loop] = llm
+        return llm
+
+
+class SupervisorAgent(_OllamaAgent):
     """
     Supervisor agent that analyzes questions and coordinates with coding agent.
     
@@ -99,12 +325,7 @@ class SupervisorAgent:
         Args:
             config: AgentConfig with model and connection settings
         """
-        # Initialize ChatOllama with configuration
-        self.llm = ChatOllama(
-            base_url=config.host,
-            model=config.model,
-            temperature=config.temperature,
-        )
+        super().__init__(config)
         
         # System prompt that defines the agent's role and behavior
         self.system_prompt = """You are a supervisor agent in an Agentic RAG system. 
@@ -121,7 +342,7 @@ When you receive a question:
 
 After receiving query results, synthesize a clear, natural language answer."""
 
-    def analyze_question(self, question: str, schema_info: str) -> str:
+    async def analyze_question_async(self, question: str, schema_info: str) -> str:
         """
         Analyze the question and determine if SQL query is needed.
         
@@ -136,78 +357,24 @@ After receiving query results, synthesize a clear, natural language answer."""
             String response from the LLM indicating "NEED_QUERY" or "NO_QUERY"
             along with an explanation
         """
-        # Construct the prompt with schema and question
-        prompt = f"""Schema information:
-{schema_info}
+        response = await self._get_llm().ainvoke(self._analysis_messages(question, schema_info))
+        return response.content
 
-User question: {question}
+    def _analysis_messages(self, question: str, schema_info: str) -> List[BaseMessage]:
+        """Build the message list asking whether a question needs a query."""
+        # Construct the prompt with the question (schema goes in its own message)
+        prompt = f"""User question: {question}
 
 Does this question require querying the database? Respond with either "NEED_QUERY" or "NO_QUERY" followed by a brief explanation."""
         
         # Build message list with system prompt and user question
-        messages = [
+        return [
+            _schema_message(schema_info),
             SystemMessage(content=self.system_prompt),
             HumanMessage(content=prompt),
         ]
-        
-        # Invoke the LLM and return the response
-        response = self.llm.invoke(messages)
-        return response.content
 
-    def verify_query(self, query: str, schema_info: str) -> Dict[str, Any]:
-        """
-        Verify the validity of a generated SQL query against the schema.
-        
-        This method asks the LLM to act as a critic, ensuring that all columns
-        used in the query actually exist in the referenced tables.
-        
-        Args:
-            query: The generated SQL query to verify
-            schema_info: Schema information
-            
-        Returns:
-            Dictionary with 'valid' (bool) and 'feedback' (str)
-        """
-        prompt = f"""Schema information:
-{schema_info}
-
-Generated SQL Query:
-{query}
-
-Verify this query. Check specifically if:
-1. All columns used in the query actually exist in their respective tables.
-2. Join keys exist in BOTH tables participating in the join.
-3. There are no "hallucinated" columns (e.g. using request_id on a table that doesn't have it).
-
-Return a JSON object with this exact format:
-{{
-    "valid": boolean,
-    "feedback": "string explaining the error if invalid, or 'Looks good' if valid"
-}}
-"""
-        messages = [
-            SystemMessage(content="You are a strict SQL Code Reviewer. Your job is to catch column hallucinations and correct them."),
-            HumanMessage(content=prompt),
-        ]
-        
-        try:
-            response = self.llm.invoke(messages)
-            content = response.content.strip()
-            # Basic cleanup if the LLM wraps JSON in markdown
-            if content.startswith("```json"):
-                content = content[7:]
-            if content.startswith("```"):
-                content = content[3:]
-            if content.endswith("```"):
-                content = content[:-3]
-            
-            import json
-            return json.loads(content.strip())
-        except Exception as e:
-            # Fallback if parsing fails - assume valid to avoid getting stuck
-            return {"valid": True, "feedback": f"Verification failed: {e}"}
-
-    def synthesize_answer(
+    async def synthesize_answer_async(
         self, question: str, query: str, results: list[Dict[str, Any]], schema_info: str
     ) -> str:
         """
@@ -226,16 +393,27 @@ Return a JSON object with this exact format:
         Returns:
             Natural language answer synthesized from the results
         """
+        messages = [
+            _schema_message(schema_info),
+            SystemMessage(content=self.system_prompt),
+            HumanMessage(content=self._build_synthesis_prompt(question, query, results)),
+        ]
+        response = await self._get_llm().ainvoke(messages)
+        return response.content
+
+    @staticmethod
+    def _build_synthesis_prompt(
+        question: str, query: str, results: list[Dict[str, Any]]
+    ) -> str:
+        """Build the human prompt used to turn query results into an answer."""
         # Limit results to first 50 rows to avoid prompt size issues
-        results_str = str(results[:50])
+        # Slice before serializing so large result sets are never stringified in full
+        results_str = json.dumps(results[:50], default=str, ensure_ascii=False)[:8000]
         if len(results) > 50:
             results_str += f"\n... (showing first 50 of {len(results)} rows)"
         
         # Construct prompt with all relevant information
-        prompt = f"""Schema information:
-{schema_info}
-
-User question: {question}
+        return f"""User question: {question}
 
 SQL query executed:
 {query}
@@ -245,17 +423,8 @@ Query results:
 
 Based on these results, provide a clear, thorough, and precise answer to the user's question. 
 Include specific numbers, trends, and insights from the data. If the results are empty, explain why."""
-        
-        # Build message list and invoke LLM
-        messages = [
-            SystemMessage(content=self.system_prompt),
-            HumanMessage(content=prompt),
-        ]
-        
-        response = self.llm.invoke(messages)
-        return response.content
 
-    def detect_complexity(self, question: str, schema_info: str) -> Dict[str, Any]:
+    async def detect_complexity_async(self, question: str, schema_info: str) -> Dict[str, Any]:
         """
         Analyze if a question is complex (multi-part) and should be decomposed.
         
@@ -269,13 +438,20 @@ Include specific numbers, trends, and insights from the data. If the results are
         Returns:
             Dictionary with:
             - is_complex: bool indicating if decomposition is needed
-            - sub_questions: list of simpler sub-questions (empty if not complex)
+            - sub_questions: list of {"id", "text", "deps"} dicts (empty if not
+              complex); "deps" lists the ids of sub-questions whose results
+              this one needs
             - original_question: the original question preserved for aggregation
         """
-        prompt = f"""Schema information:
-{schema_info}
+        try:
+            response = await self._get_llm().ainvoke(self._complexity_messages(question, schema_info))
+            return self._parse_complexity(response.content, question)
+        except Exception as e:
+            return self._simple_complexity(question, e)
 
-User question: {question}
+    def _complexity_messages(self, question: str, schema_info: str) -> List[BaseMessage]:
+        """Build the message list asking whether a question should be decomposed."""
+        prompt = f"""User question: {question}
 
 Analyze this question to determine if it should be decomposed into simpler sub-questions.
 
@@ -292,53 +468,54 @@ If COMPLEX, break it down into sub-questions where each:
 - Asks for ONE specific metric or closely related metrics
 - Can be answered with a simple SELECT with basic aggregation
 - Preserves any time period or filtering context from the original question
+- Lists in "deps" the ids of earlier sub-questions whose RESULTS it needs (usually none)
 
 Return a JSON object with this exact format:
 {{
     "is_complex": boolean,
-    "sub_questions": ["sub-question 1", "sub-question 2", ...] (empty array if not complex),
+    "sub_questions": [
+        {{"id": 1, "text": "sub-question 1", "deps": []}},
+        {{"id": 2, "text": "sub-question 2", "deps": [1]}},
+        ...
+    ] (empty array if not complex),
     "reasoning": "brief explanation of why this is/isn't complex"
 }}"""
 
-        messages = [
+        return [
+            _schema_message(schema_info),
             SystemMessage(content=self.system_prompt),
             HumanMessage(content=prompt),
         ]
-        
-        try:
-            response = self.llm.invoke(messages)
-            content = response.content.strip()
-            
-            # Clean up markdown code blocks if present
-            if content.startswith("```json"):
-                content = content[7:]
-            if content.startswith("```"):
-                content = content[3:]
-            if content.endswith("```"):
-                content = content[:-3]
-            
-            # Sanitize control characters that break JSON parsing
-            import re
-            content = re.sub(r'[\x00-\x1f\x7f-\x9f]', ' ', content.strip())
-            
-            import json
-            result = json.loads(content)
-            result["original_question"] = question
-            return result
-            
-        except Exception as e:
-            # If parsing fails, treat as simple question
-            return {
-                "is_complex": False,
-                "sub_questions": [],
-                "original_question": question,
-                "reasoning": f"Failed to analyze complexity: {e}"
-            }
-
-    def aggregate_results(
-        self, 
-        original_question: str, 
-        sub_results: list[Dict[str, Any]], 
+
+    @staticmethod
+    def _parse_complexity(content: str, question: str) -> Dict[str, Any]:
+        """Parse the complexity verdict JSON and attach the original question."""
+        # Clean up markdown code blocks if present
+        content = _strip_fence(content)
+        
+        # Sanitize control characters that break JSON parsing
+        content = _CTRL_RE.sub(' ', content)
+        
+        result = orjson.loads(content)
+        result["sub_questions"] = _normalize_sub_questions(result.get("sub_questions") or [])
+        result["original_question"] = question
+        return result
+
+    @staticmethod
+    def _simple_complexity(question: str, error: Exception) -> Dict[str, Any]:
+        """Fallback verdict treating the question as simple."""
+        return {
+            "is_complex": False,
+            "sub_questions": [],
+            "original_question": question,
+            "reasoning": f"Failed to analyze complexity: {error}",
+            "error": str(error),
+        }
+
+    async def aggregate_results_async(
+        self,
+        original_question: str,
+        sub_results: list[Dict[str, Any]],
         schema_info: str
     ) -> str:
         """
@@ -351,6 +528,7 @@ Return a JSON object with this exact format:
         Args:
             original_question: The original user question (before decomposition)
             sub_results: List of dictionaries, each containing:
+                - id: (optional) Sub-question id from detect_complexity_async
                 - sub_question: The sub-question that was asked
                 - query: SQL query that was executed
                 - results: Query results as list of dicts
@@ -360,22 +538,30 @@ Return a JSON object with this exact format:
         Returns:
             Comprehensive natural language answer combining all sub-results
         """
+        messages = self._aggregation_messages(original_question, sub_results, schema_info)
+        response = await self._get_llm().ainvoke(messages)
+        return response.content
+
+    def _aggregation_messages(
+        self,
+        original_question: str,
+        sub_results: list[Dict[str, Any]],
+        schema_info: str
+    ) -> List[BaseMessage]:
+        """Build the message list combining all sub-question results."""
         # Format sub-results for the prompt
         sub_results_formatted = []
         for i, sr in enumerate(sub_results, 1):
             formatted = f"""
---- Sub-question {i} ---
+--- Sub-question {sr.get('id', i)} ---
 Question: {sr.get('sub_question', 'N/A')}
 SQL Query: {sr.get('query', 'N/A')}
-Results: {str(sr.get('results', []))[:500]}"""  # Limit result size
+Results: {json.dumps((sr.get('results') or [])[:20], default=str, ensure_ascii=False)[:500]}"""  # Limit result size
             sub_results_formatted.append(formatted)
         
         all_sub_results = "\n".join(sub_results_formatted)
         
-        prompt = f"""Schema information:
-{schema_info}
-
-ORIGINAL USER QUESTION: {original_question}
+        prompt = f"""ORIGINAL USER QUESTION: {original_question}
 
 The question was decomposed into sub-questions, and here are all the results:
 {all_sub_results}
@@ -389,16 +575,14 @@ Based on ALL these results, provide a comprehensive answer that:
 
 Synthesize a single, cohesive answer that combines all the partial results."""
 
-        messages = [
+        return [
+            _schema_message(schema_info),
             SystemMessage(content=self.system_prompt),
             HumanMessage(content=prompt),
         ]
-        
-        response = self.llm.invoke(messages)
-        return response.content
 
 
-class CodingAgent:
+class CodingAgent(_OllamaAgent):
     """
     Coding agent that generates SQL queries from natural language questions.
     
@@ -414,12 +598,7 @@ class CodingAgent:
         Args:
             config: AgentConfig with model and connection settings
         """
-        # Initialize ChatOllama with configuration
-        self.llm = ChatOllama(
-            base_url=config.host,
-            model=config.model,
-            temperature=config.temperature,
-        )
+        super().__init__(config)
         
         # System prompt that defines the agent's role as a SQL generator
         self.system_prompt = """You are a coding agent specialized in generating SQL queries for DuckDB.
@@ -463,67 +642,85 @@ General SQL Rules:
 - Use ORDER BY for meaningful result ordering
 - Return ONLY the SQL query, no explanations or markdown"""
 
-    def generate_query(self, question: str, schema_info: str, feedback: Optional[str] = None, previous_query: Optional[str] = None) -> str:
+    async def generate_verified_query_async(
+        self,
+        question: str,
+        schema_info: str,
+        validator: Callable[[str], Dict[str, Any]],
+        max_retries: int = 3,
+    ) -> Dict[str, Any]:
         """
-        Generate a SQL query based on the question and schema.
+        Generate a SQL query and repair it until it passes validation.
         
-        This method sends the question and schema to the LLM and asks it
-        to generate a SQL query that will answer the question.
+        Corrections continue the same conversation: the failed query stays
+        in context as the assistant's turn and the validation error is sent
+        back as the next user turn, so each retry is a single LLM call with
+        no re-rendering of the full prompt. LLM calls use the non-blocking
+        client; the (synchronous) validator runs in a worker thread.
         
         Args:
             question: User's natural language question
             schema_info: Human-readable schema description
-            feedback: Optional feedback from a previous failed attempt
-            previous_query: The failed query string from the previous attempt
+            validator: Callable returning {'valid': bool, 'error': str} for a
+                query (e.g. DuckDBManager.validate_schema)
+            max_retries: Maximum number of corrections after the first draft
             
         Returns:
-            SQL query string (cleaned of markdown formatting if present)
+            Dictionary with:
+            - query: Last generated SQL query
+            - valid: Whether it passed validation
+            - feedback: Last validation error ('' if valid)
+            - checked: Whether the validator accepted or rejected the query
+              (False if it raised and the query was passed through unchecked)
+            - attempts: Number of LLM calls made
         """
-        # Construct prompt with schema and question
-        prompt_content = f"""Schema information:
-{schema_info}
-
-User question: {question}
-"""
+        messages: List[BaseMessage] = [
+            _schema_message(schema_info),
+            SystemMessage(content=self.system_prompt),
+            HumanMessage(content=self._build_prompt(question)),
+        ]
         
-        # Add feedback if provided (Self-Correction Loop)
-        if feedback:
-            prompt_content += f"""
-=== CORRECTION REQUIRED ===
+        attempts = 0
+        while True:
+            response = await self._get_llm().ainvoke(messages)
+            attempts += 1
+            query = _strip_fence(response.content)
+            
+            try:
+                verdict = await asyncio.to_thread(validator, query)
+            except Exception as e:
+                # Fail open: a broken validator must not block the answer
+                return {"query": query, "valid": True, "feedback": f"Verification system error: {e}", "checked": False, "attempts": attempts}
+            
+            if verdict.get("valid", True):
+                return {"query": query, "valid": True, "feedback": "", "checked": True, "attempts": attempts}
+            feedback = verdict.get("error", "")
+            if attempts > max_retries:
+                return {"query": query, "valid": False, "feedback": feedback, "checked": True, "attempts": attempts}
+            
+            messages.append(AIMessage(content=response.content))
+            messages.append(HumanMessage(content=self._correction_prompt(feedback)))
+
+    @staticmethod
+    def _correction_prompt(feedback: str) -> str:
+        """Build the follow-up turn asking the coding LLM to fix its last query."""
+        return f"""=== CORRECTION REQUIRED ===
 Your previous query FAILED with this error:
 {feedback}
-"""
-            if previous_query:
-                prompt_content += f"""
-FAILED QUERY:
-{previous_query}
+""" + _FIX_INSTRUCTIONS + "\nReturn ONLY the corrected SQL query, no explanations or markdown code blocks."
 
-IMPORTANT FIX INSTRUCTIONS:
-1. The error says a column does NOT EXIST in that table. DO NOT USE THAT COLUMN.
-2. Check the "Detected Relationships" section to find the CORRECT join columns.
-3. If the tables you're joining don't share the column you used, find the column they DO share.
-4. Consider: maybe you don't need a JOIN at all? Check if all needed columns are in ONE table.
-5. Look at the relationship: "requests and trip_forms are linked by: trip_form_id" - use trip_form_id NOT request_id.
+    def _build_prompt(self, question: str) -> str:
+        """
+        Build the human prompt for query generation.
+        
+        Args:
+            question: User's natural language question
+            
+        Returns:
+            Prompt string for the coding LLM (the schema is sent separately)
+        """
+        # Construct prompt with the question (schema goes in its own message)
+        prompt_content = f"""User question: {question}
 """
-
         prompt_content += "\nGenerate a SQL query to answer this question. Return ONLY the SQL query, no explanations or markdown code blocks."
-        
-        # Build message list and invoke LLM
-        messages = [
-            SystemMessage(content=self.system_prompt),
-            HumanMessage(content=prompt_content),
-        ]
-        
-        response = self.llm.invoke(messages)
-        query = response.content.strip()
-        
-        # Clean up markdown code blocks if the LLM included them
-        # Some LLMs wrap code in ```sql ... ``` blocks
-        if query.startswith("```sql"):
-            query = query[6:]
-        if query.startswith("```"):
-            query = query[3:]
-        if query.endswith("```"):
-            query = query[:-3]
-        
-        return query.strip()
+        return prompt_content
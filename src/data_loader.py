@@ -6,15 +6,106 @@ them into DuckDB tables. Each sheet in an Excel workbook becomes a separate
 DuckDB table, allowing SQL queries to be executed across the data.
 """
 
+import hashlib
+import json
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 
 import duckdb
+import openpyxl
 import pandas as pd
+import pyarrow as pa
 
 from config import settings
+from src.db_manager import LOAD_HASHES_TABLE
 from src.schema_manager import ColumnInfo
 
+logger = logging.getLogger(__name__)
+
+
+# Excel/metadata type names -> DuckDB types
+_EXCEL_TO_DUCKDB: Dict[str, str] = {
+    'STRING': 'VARCHAR',
+    'TEXT': 'VARCHAR',
+    'STR': 'VARCHAR',
+    'INTEGER': 'INTEGER',
+    'INT': 'INTEGER',
+    'FLOAT': 'DOUBLE',
+    'DOUBLE': 'DOUBLE',
+    'NUMERIC': 'DOUBLE',
+    'BOOLEAN': 'BOOLEAN',
+    'BOOL': 'BOOLEAN',
+    'TIMESTAMP': 'TIMESTAMP',
+    'DATETIME': 'TIMESTAMP',
+    'DATE': 'DATE'
+}
+
+# Translation table replacing every non-alphanumeric (Latin-1) character except '_'
+_SAFE_TABLE_TR = str.maketrans({
+    c: '_' for c in map(chr, range(256)) if not (c.isalnum() or c == '_')
+})
+
+
+# DuckDB target type -> Arrow type that DuckDB maps back to the same type
+_ARROW_TYPES: Dict[str, pa.DataType] = {
+    'VARCHAR': pa.string(),
+    'INTEGER': pa.int32(),
+    'DOUBLE': pa.float64(),
+    'BOOLEAN': pa.bool_(),
+    'TIMESTAMP': pa.timestamp('us'),
+    'DATE': pa.date32(),
+}
+
+# Bookkeeping table storing a content hash per loaded table (see DuckDBManager.data_version)
+_LOAD_HASHES_TABLE = LOAD_HASHES_TABLE
+
+# Mixed into native-path table hashes; bump when the read_xlsx options change
+_NATIVE_READER_VERSION = b"read_xlsx:all_varchar"
+
+# Metadata used for columns not described in a metadata sheet
+_DEFAULT_COLUMN_META: Dict[str, Any] = {'type': 'STRING', 'duckdb_type': 'VARCHAR', 'description': None}
+
+# Accepted header names for the columns of a metadata sheet (lowercase)
+_NAME_COL_CANDIDATES = ('field name', 'fieldname', 'name', 'column', 'field')
+_TYPE_COL_CANDIDATES = ('type', 'datatype', 'data type')
+_DESC_COL_CANDIDATES = ('description', 'desc', 'definition')
+
+
+def _warn(warnings: List[str], msg: str, *args: Any) -> None:
+    """
+    Record a load warning and emit it through the module logger.
+    
+    Args:
+        warnings: List collecting load warnings
+        msg: %-style message template
+        *args: Template arguments
+    """
+    logger.warning(msg, *args)
+    warnings.append(msg % args)
+
+
+def _find_column(cols: Dict[str, Any], candidates: Tuple[str, ...]) -> Optional[Any]:
+    """
+    Find the first metadata column whose normalized header is in candidates.
+    
+    Args:
+        cols: Mapping of lowercased/stripped header -> original column label
+        candidates: Accepted header names, in priority order
+        
+    Returns:
+        Original column label, or None if no candidate is present
+    """
+    for cand in candidates:
+        if cand in cols:
+            return cols[cand]
+    return None
+
 
 def map_excel_type_to_duckdb(excel_type: str) -> str:
     """
@@ -28,29 +119,522 @@ def map_excel_type_to_duckdb(excel_type: str) -> str:
     """
     if not excel_type:
         return 'VARCHAR'
+    return _EXCEL_TO_DUCKDB.get(excel_type.upper().strip(), 'VARCHAR')
+
+
+def _read_sheet(ws: Any) -> pd.DataFrame:
+    """
+    Stream a read-only worksheet into a DataFrame.
+    
+    Rows are pulled from openpyxl's row iterator and handed to pandas as a
+    generator, so the sheet is built in one pass without an intermediate
+    copy. The first row is used as the header, like pandas.read_excel.
+    
+    Args:
+        ws: Worksheet from a workbook opened with read_only=True
+        
+    Returns:
+        DataFrame with the sheet contents (empty if the sheet has no rows)
+    """
+    # Stored dimensions can be stale in read-only mode and would truncate the sheet
+    ws.reset_dimensions()
+    rows = ws.iter_rows(values_only=True)
+    header = next(rows, None)
+    if header is None:
+        return pd.DataFrame()
+    
+    columns = [c if c is not None else f"Unnamed: {i}" for i, c in enumerate(header)]
+    df = pd.DataFrame.from_records(rows, columns=columns)
+    
+    # Drop blank rows and unnamed all-empty columns (read_excel does the same)
+    df = df.dropna(how="all")
+    empty_unnamed = [
+        c for c in df.columns
+        if isinstance(c, str) and c.startswith("Unnamed: ") and df[c].isna().all()
+    ]
+    return df.drop(columns=empty_unnamed).reset_index(drop=True)
+
+
+def _sheet_is_empty(ws: Any) -> bool:
+    """
+    Cheaply check whether a read-only worksheet has no data rows.
+    
+    The stored dimensions are checked first; when they are missing or claim at
+    most one row (header only), only the first two rows of the XML stream are
+    parsed to confirm, instead of reading the whole sheet.
+    
+    Args:
+        ws: Worksheet from a workbook opened with read_only=True
+        
+    Returns:
+        True if the sheet has at most a header row
+    """
+    if ws.max_row is not None and ws.max_row > 1:
+        return False
+    ws.reset_dimensions()
+    return sum(1 for _ in islice(ws.iter_rows(values_only=True), 2)) < 2
+
+
+def _read_sheet_from_file(workbook: Path, sheet: str) -> pd.DataFrame:
+    """
+    Open a workbook in read-only mode and stream a single sheet into a DataFrame.
+    
+    Args:
+        workbook: Path to the .xlsx file
+        sheet: Sheet title
+        
+    Returns:
+        DataFrame with the sheet contents
+    """
+    wb = openpyxl.load_workbook(workbook, read_only=True, data_only=True)
+    try:
+        return _read_sheet(wb[sheet])
+    finally:
+        wb.close()
+
+
+def _column_to_arrow(series: pd.Series, duck_type: str) -> Tuple[pa.Array, bool]:
+    """
+    Convert a DataFrame column to an Arrow array of its DuckDB target type.
+    
+    Conversion is lossless-only (Arrow's safe casting). If any value does not
+    convert cleanly, the column is returned in its inferred type (or as text for
+    mixed objects) and the caller applies TRY_CAST in SQL so that invalid values
+    become NULL, as before.
+    
+    Args:
+        series: DataFrame column
+        duck_type: Target DuckDB type from the metadata sheet
+        
+    Returns:
+        Tuple of (arrow array, True if already in the target type)
+    """
+    target = _ARROW_TYPES.get(duck_type)
+    if target is not None:
+        try:
+            return pa.array(series, type=target, from_pandas=True), True
+        except (pa.ArrowException, ValueError, TypeError, OverflowError):
+            pass
+    
+    try:
+        return pa.array(series, from_pandas=True), False
+    except (pa.ArrowException, ValueError, TypeError, OverflowError):
+        as_text = series.map(lambda v: None if pd.isna(v) else str(v))
+        return pa.array(as_text, type=pa.string(), from_pandas=True), False
+
+
+def _needs_cast(source_type: str, duck_type: str) -> bool:
+    """
+    Check whether a column must be wrapped in TRY_CAST to reach its target type.
+    
+    Args:
+        source_type: DuckDB type the column already has (e.g. from DESCRIBE)
+        duck_type: Target DuckDB type from the metadata sheet
+        
+    Returns:
+        False if the column is already of the target type
+    """
+    return source_type.upper() != duck_type
+
+
+def _file_digest(path: Path) -> str:
+    """Compute a BLAKE2b digest of a file's contents."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _table_hash(
+    pairs: List[Tuple[str, Dict[str, Any]]],
+    df: Optional[pd.DataFrame],
+    workbook: Path,
+    sheet: str,
+    file_digests: Dict[Path, str],
+) -> Optional[str]:
+    """
+    Fingerprint a data table's content together with its target column types.
+    
+    DataFrames are hashed by value; sheets read natively by DuckDB are hashed
+    by their workbook's bytes and sheet name.
+    
+    Args:
+        pairs: (column name, column metadata) for every column
+        df: Sheet contents, or None for the native path
+        workbook: Source workbook path
+        sheet: Sheet title
+        file_digests: Per-run memo of workbook digests
+        
+    Returns:
+        Hex digest, or None if the content cannot be hashed
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update("\x1f".join(f"{n}:{m['duckdb_type']}" for n, m in pairs).encode())
+    try:
+        if df is not None:
+            h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+        else:
+            if workbook not in file_digests:
+                file_digests[workbook] = _file_digest(workbook)
+            h.update(file_digests[workbook].encode())
+            h.update(sheet.encode())
+            # Reader settings are part of the content: tables loaded with other
+            # read_xlsx options must be rewritten, not skipped as unchanged
+            h.update(_NATIVE_READER_VERSION)
+    except (TypeError, ValueError, OSError):
+        return None
+    return h.hexdigest()
+
+
+def _sql_literal(value: str) -> str:
+    """Quote a Python string as a SQL string literal."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _load_excel_extension(con: duckdb.DuckDBPyConnection, warnings: List[str]) -> bool:
+    """
+    Load DuckDB's native Excel extension, installing it on first use.
+    
+    LOAD is tried first so that runs after the first one never touch the
+    extension repository; INSTALL (a download) only happens when the
+    extension is not installed locally yet.
+    
+    Args:
+        con: Active DuckDB connection object
+        warnings: List collecting load warnings
+        
+    Returns:
+        True if read_xlsx() is available, False otherwise (e.g. offline install)
+    """
+    try:
+        con.execute("LOAD excel")
+        return True
+    except duckdb.Error:
+        pass
+    try:
+        con.execute("INSTALL excel")
+        con.execute("LOAD excel")
+        return True
+    except duckdb.Error as e:
+        _warn(warnings, "DuckDB excel extension unavailable (%s). Loading sheets via pandas.", e)
+        return False
+
+
+# A data sheet to load: (table_name, dataframe, workbook, sheet).
+# The dataframe is None for sheets that DuckDB reads natively.
+DataTable = Tuple[str, Optional[pd.DataFrame], Path, str]
+
+
+def _read_workbook(
+    workbook: Path, use_native: bool
+) -> Tuple[List[DataTable], Dict[str, pd.DataFrame], List[str]]:
+    """
+    Read one workbook and split its sheets into data and metadata sheets.
+    
+    Safe to run in a worker thread: it only touches the file, never DuckDB.
+    
+    Args:
+        workbook: Path to the .xlsx file
+        use_native: If True, data sheets are left for DuckDB's read_xlsx
+        
+    Returns:
+        Tuple of (data tables, metadata dataframes keyed by table name, warnings)
+    """
+    data_tables: List[DataTable] = []
+    metadata_dfs: Dict[str, pd.DataFrame] = {}
+    warnings: List[str] = []
+    
+    try:
+        # read_only streams each sheet's XML instead of building the whole workbook model
+        wb = openpyxl.load_workbook(workbook, read_only=True, data_only=True)
+    except Exception as e:
+        _warn(warnings, "Error reading Excel file '%s': %s", workbook.name, e)
+        return data_tables, metadata_dfs, warnings
     
-    t = excel_type.upper().strip()
+    try:
+        for ws in wb.worksheets:
+            sheet = ws.title
+            try:
+                # Sanitize table name
+                table_name = f"{workbook.stem}_{sheet}".lower().translate(_SAFE_TABLE_TR)
+                is_metadata = table_name.endswith('_')
+                
+                # Skip template/empty sheets without parsing them
+                if _sheet_is_empty(ws):
+                    _warn(warnings, "Sheet '%s' in '%s' is empty, skipping", sheet, workbook.name)
+                    continue
+                
+                if use_native and not is_metadata:
+                    # Parsed by DuckDB directly when the table is created
+                    data_tables.append((table_name, None, workbook, sheet))
+                    continue
+                
+                df = _read_sheet(ws)
+                
+                if df.empty:
+                    _warn(warnings, "Sheet '%s' in '%s' is empty, skipping", sheet, workbook.name)
+                    continue
+                
+                # Check if it's a metadata sheet (ends in _)
+                if is_metadata:
+                    metadata_dfs[table_name] = df
+                    # Do NOT load into DuckDB
+                else:
+                    data_tables.append((table_name, df, workbook, sheet))
+                    
+            except Exception as e:
+                _warn(warnings, "Error loading sheet '%s' from '%s': %s", sheet, workbook.name, e)
+                continue
+    finally:
+        wb.close()
+    
+    return data_tables, metadata_dfs, warnings
+
+
+def _parse_column_metadata(m_df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    """
+    Extract per-column type and description metadata from a metadata sheet.
+    
+    Args:
+        m_df: Metadata sheet contents (one row per described column)
+        
+    Returns:
+        Mapping of lowercased column name -> {'type', 'duckdb_type',
+        'description', 'original_name'}
+    """
+    col_metadata: Dict[str, Dict[str, Any]] = {}
+    
+    # Find column headers
+    cols = {str(c).lower().strip(): c for c in m_df.columns}
+    
+    name_col = _find_column(cols, _NAME_COL_CANDIDATES)
+    type_col = _find_column(cols, _TYPE_COL_CANDIDATES)
+    desc_col = _find_column(cols, _DESC_COL_CANDIDATES)
+    
+    if name_col:
+        # Column-wise extraction instead of iterrows (no per-cell boxing)
+        mask = m_df[name_col].notna()
+        names = m_df.loc[mask, name_col].astype(str).str.strip()
+        
+        if type_col:
+            types = m_df.loc[mask, type_col].fillna('VARCHAR').astype(str)
+        else:
+            types = pd.Series('VARCHAR', index=names.index)
+        
+        if desc_col:
+            # Built explicitly: Series.where(..., None) yields NaN on pandas 3
+            descs = [str(v) if pd.notna(v) else None for v in m_df.loc[mask, desc_col]]
+        else:
+            descs = [None] * len(names)
+        
+        duck_types = types.map(map_excel_type_to_duckdb)
+        
+        for c_name, c_type, c_duck_type, c_desc in zip(names, types, duck_types, descs):
+            col_metadata[c_name.lower()] = {
+                'type': c_type,
+                'duckdb_type': c_duck_type,
+                'description': c_desc,
+                'original_name': c_name
+            }
+    
+    return col_metadata
+
+
+def _load_table(
+    con: duckdb.DuckDBPyConnection,
+    table: DataTable,
+    metadata_dfs: Dict[str, pd.DataFrame],
+    existing_tables: set,
+    stored_hashes: Dict[str, str],
+    file_digests: Dict[Path, str],
+) -> Tuple[Optional[List[ColumnInfo]], Optional[str], List[str]]:
+    """
+    Create (or keep) one DuckDB table from a data sheet with type enforcement.
     
-    mapping = {
-        'STRING': 'VARCHAR',
-        'TEXT': 'VARCHAR',
-        'STR': 'VARCHAR',
-        'INTEGER': 'INTEGER',
-        'INT': 'INTEGER',
-        'FLOAT': 'DOUBLE',
-        'DOUBLE': 'DOUBLE',
-        'NUMERIC': 'DOUBLE',
-        'BOOLEAN': 'BOOLEAN',
-        'BOOL': 'BOOLEAN',
-        'TIMESTAMP': 'TIMESTAMP',
-        'DATETIME': 'TIMESTAMP',
-        'DATE': 'DATE'
-    }
+    Args:
+        con: Connection or cursor to write the table on
+        table: (table_name, dataframe, workbook, sheet) to load
+        metadata_dfs: Metadata sheet contents keyed by metadata table name
+        existing_tables: Tables present in the database before this load
+        stored_hashes: Content hash per previously loaded table
+        file_digests: Per-run memo of workbook digests
+        
+    Returns:
+        Tuple of (column definitions, or None if the sheet turned out empty;
+        content hash to record, or None if the table was left unchanged - a
+        random token if the content cannot be hashed; warnings)
+        
+    Raises:
+        Exception: Any error while creating the table
+    """
+    table_name, df, workbook, sheet = table
+    warnings: List[str] = []
     
-    return mapping.get(t, 'VARCHAR')
+    # Parse metadata if available
+    metadata_name = table_name + "_"
+    col_metadata: Dict[str, Dict[str, Any]] = {}
+    if metadata_name in metadata_dfs:
+        col_metadata = _parse_column_metadata(metadata_dfs[metadata_name])
 
+    tmp_view = f"tmp_{table_name}"
+    if df is None:
+        # Native path: DuckDB parses the sheet straight into its columnar store.
+        # Cells are read as text and typed below from the metadata sheet, like the
+        # pandas path: inferring types from the first row would NULL later cells
+        # that do not fit, and would render whole-number cells as e.g. '1.0'.
+        # Reading does not stop at the first blank row; blank rows are dropped.
+        source = (
+            f"read_xlsx({_sql_literal(str(workbook))}, sheet = {_sql_literal(sheet)}, "
+            f"header = true, all_varchar = true, stop_at_empty = false)"
+        )
+        try:
+            described = con.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()
+            columns = [row[0] for row in described]
+            column_types = [row[1] for row in described]
+        except duckdb.Error as e:
+            _warn(warnings, "Native Excel reader failed on '%s' (%s), falling back to pandas", table_name, e)
+            df = _read_sheet_from_file(workbook, sheet)
+            if df.empty:
+                _warn(warnings, "Sheet '%s' in '%s' is empty, skipping", sheet, workbook.name)
+                return None, None, warnings
+    
+    if df is not None:
+        columns = df.columns.tolist()
+    
+    # Resolve each column's metadata once (case-insensitive lookup)
+    pairs = [(n, col_metadata.get(n.lower(), _DEFAULT_COLUMN_META)) for n in map(str, columns)]
+    col_names = [n for n, _ in pairs]
+    
+    # Keep original type for LLM prompt context
+    table_columns: List[ColumnInfo] = [
+        {'name': n, 'type': m['type'], 'description': m['description']}
+        for n, m in pairs
+    ]
+    
+    # Skip rewriting tables whose data and target types are unchanged
+    content_hash = _table_hash(pairs, df, workbook, sheet, file_digests)
+    if (
+        content_hash is not None
+        and table_name in existing_tables
+        and stored_hashes.get(table_name) == content_hash
+    ):
+        print(f"Table '{table_name}' unchanged, skipping rewrite")
+        return table_columns, None, warnings
+    
+    if df is not None:
+        # Hand DuckDB Arrow columns already in the target type when possible
+        conversions = [
+            _column_to_arrow(df.iloc[:, i], m['duckdb_type']) for i, (_, m) in enumerate(pairs)
+        ]
+        arrow_arrays = [array for array, _ in conversions]
+        converted = [ok for _, ok in conversions]
+    else:
+        # read_xlsx returned every column as VARCHAR; cast all other target types
+        arrow_arrays = []
+        converted = [
+            not _needs_cast(t, m['duckdb_type']) for t, (_, m) in zip(column_types, pairs)
+        ]
+    
+    # Build CREATE TABLE select list: TRY_CAST(col AS TYPE) unless already typed.
+    # Column names are double quoted to handle special chars/keywords.
+    select_parts = [
+        f'"{n}"' if ok else f'TRY_CAST("{n}" AS {m["duckdb_type"]}) AS "{n}"'
+        for (n, m), ok in zip(pairs, converted)
+    ]
+    if df is not None:
+        # Register the typed Arrow table; DuckDB scans its buffers without copying
+        arrow_table = pa.Table.from_arrays(arrow_arrays, names=col_names)
+        con.register(view_name=tmp_view, python_object=arrow_table)
+        source = tmp_view
+    
+    # Execute CREATE TABLE with explicit types
+    query = f"CREATE OR REPLACE TABLE {table_name} AS SELECT {', '.join(select_parts)} FROM {source}"
+    if df is None and col_names:
+        # Skip blank rows, as the pandas path does
+        quoted = ", ".join(f'"{n}"' for n in col_names)
+        query += f" WHERE COALESCE({quoted}) IS NOT NULL"
+    con.execute(query)
+    
+    if df is not None:
+        con.unregister(tmp_view)
+        row_count = len(df)
+    else:
+        row_count = con.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+        if row_count == 0:
+            con.execute(f"DROP TABLE {table_name}")
+            _warn(warnings, "Sheet '%s' in '%s' is empty, skipping", sheet, workbook.name)
+            return None, None, warnings
+    
+    print(f"Loaded table '{table_name}' with type enforcement ({row_count} rows)")
+    # Unhashable content still records a (never matching) token, so every
+    # rewrite changes the data version that answer caches are keyed on
+    return table_columns, content_hash or uuid.uuid4().hex, warnings
 
-def load_excel_files(con: duckdb.DuckDBPyConnection) -> Dict[str, List[ColumnInfo]]:
+
+def _load_table_on_cursor(
+    table: DataTable, con: duckdb.DuckDBPyConnection, **kwargs: Any
+) -> Tuple[Optional[List[ColumnInfo]], Optional[str], List[str], Optional[Exception]]:
+    """
+    Run _load_table on a fresh cursor of con (thread pool entry point).
+    
+    Args:
+        table: (table_name, dataframe, workbook, sheet) to load
+        con: Connection whose database the table is written to
+        **kwargs: Remaining _load_table arguments
+        
+    Returns:
+        _load_table's result plus the exception that aborted it (None on success)
+    """
+    cursor = con.cursor()
+    try:
+        return (*_load_table(cursor, table, **kwargs), None)
+    except Exception as e:
+        return None, None, [], e
+    finally:
+        cursor.close()
+
+
+def _load_cache_path() -> Path:
+    """Location of the per-workbook load cache (next to the schema file)."""
+    return Path(settings.schema_path + ".cache.json")
+
+
+def _file_key(workbook: Path) -> List[int]:
+    """Cache key identifying a workbook version: [mtime_ns, size]."""
+    stat = workbook.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _read_load_cache() -> Dict[str, Dict[str, Any]]:
+    """
+    Read the per-workbook load cache.
+    
+    Returns:
+        Mapping of workbook path -> {"key": [mtime_ns, size], "tables": {name: columns}},
+        or an empty dict if the cache is missing or unreadable
+    """
+    try:
+        with open(_load_cache_path(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _write_load_cache(cache: Dict[str, Dict[str, Any]]) -> None:
+    """Persist the per-workbook load cache; failures only cost a full reload next time."""
+    path = _load_cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+    except OSError as e:
+        logger.warning("Could not write load cache %s: %s", path, e)
+
+
+def load_excel_files(
+    con: duckdb.DuckDBPyConnection,
+) -> Tuple[Dict[str, List[ColumnInfo]], List[str]]:
     """
     Load all Excel workbooks from DATA_DIR into DuckDB tables with strict type enforcement.
     
@@ -61,12 +645,26 @@ def load_excel_files(con: duckdb.DuckDBPyConnection) -> Dict[str, List[ColumnInf
     4. Loads data sheets, applying explicit type casting (TRY_CAST) based on metadata
     5. Returns a rich schema mapping
     
+    Workbooks whose (mtime, size) match the load cache next to the schema file,
+    and whose tables still exist in the database, are not re-read; their cached
+    column definitions are returned instead.
+    
+    Data sheets are read by DuckDB's native Excel extension (read_xlsx) when it
+    is available, so they never pass through pandas. Metadata sheets are small
+    and are always read with openpyxl/pandas. If the extension cannot be loaded
+    or fails on a given sheet, that sheet falls back to the pandas path.
+    Tables are created concurrently, each on its own cursor of con.
+    
     Args:
         con: Active DuckDB connection object
         
     Returns:
-        Dictionary mapping table names to their rich column definitions.
+        Tuple of (dictionary mapping table names to their rich column definitions,
+        list of warnings for skipped or failed files/sheets). Warnings are also
+        emitted through the module logger.
     """
+    warnings: List[str] = []
+    
     # Get the data directory path and ensure it exists
     data_path = Path(settings.data_dir)
     data_path.mkdir(parents=True, exist_ok=True)
@@ -76,137 +674,123 @@ def load_excel_files(con: duckdb.DuckDBPyConnection) -> Dict[str, List[ColumnInf
     
     # Early return if no Excel files found
     if not excel_files:
-        print(f"Warning: No Excel files found in {data_path}")
-        return {}
+        _warn(warnings, "No Excel files found in %s", data_path)
+        return {}, warnings
 
-    # Store found tables to process later: (table_name, dataframe)
-    data_tables: List[Tuple[str, pd.DataFrame]] = []
+    # Reuse workbooks that are unchanged since the last load and whose tables
+    # still exist in the database
+    load_cache = _read_load_cache()
+    file_keys = {str(wb): _file_key(wb) for wb in excel_files}
+    existing_tables = {row[0] for row in con.execute("SHOW TABLES").fetchall()}
+    
+    schema: Dict[str, List[ColumnInfo]] = {}
+    reused: List[str] = []
+    to_read: List[Path] = []
+    
+    for workbook in excel_files:
+        entry = load_cache.get(str(workbook))
+        if (
+            entry is not None
+            and entry.get("key") == file_keys[str(workbook)]
+            and set(entry.get("tables", {})) <= existing_tables
+        ):
+            schema.update(entry["tables"])
+            reused.append(str(workbook))
+        else:
+            to_read.append(workbook)
+    
+    if reused:
+        print(f"Reusing {len(reused)} unchanged Excel file(s) from {_load_cache_path()}")
+
+    results = []
+    if to_read:
+        # Use DuckDB's C++ Excel reader for data sheets when available
+        use_native = _load_excel_extension(con, warnings)
+        
+        # Step 1: Read all files and categorize sheets
+        # Workbooks are independent and parsing is dominated by zip/XML work, so read
+        # them concurrently. DuckDB writes stay serial in step 2 (one shared connection).
+        print(f"Scanning {len(to_read)} Excel file(s)...")
+        
+        read_workbook = partial(_read_workbook, use_native=use_native)
+        with ThreadPoolExecutor(max_workers=min(8, len(to_read))) as executor:
+            results = list(executor.map(read_workbook, to_read))
+    
+    # Store found tables to process later
+    data_tables: List[DataTable] = []
     
     # Store metadata dataframes: table_name -> dataframe
     metadata_dfs: Dict[str, pd.DataFrame] = {}
-
-    # Step 1: Read all files and categorize sheets
-    print(f"Scanning {len(excel_files)} Excel file(s)...")
     
-    for workbook in excel_files:
-        try:
-            xl = pd.ExcelFile(workbook)
-            
-            for sheet in xl.sheet_names:
-                try:
-                    df = xl.parse(sheet)
-                    
-                    if df.empty:
-                        print(f"Warning: Sheet '{sheet}' in '{workbook.name}' is empty, skipping")
-                        continue
-                    
-                    # Sanitize table name
-                    raw_name = f"{workbook.stem}_{sheet}".lower().replace(" ", "_").replace("-", "_")
-                    table_name = "".join(c if c.isalnum() or c == "_" else "_" for c in raw_name)
-                    
-                    # Check if it's a metadata sheet (ends in _)
-                    if table_name.endswith('_'):
-                        metadata_dfs[table_name] = df
-                        # Do NOT load into DuckDB
-                    else:
-                        data_tables.append((table_name, df))
-                        
-                except Exception as e:
-                    print(f"Error loading sheet '{sheet}' from '{workbook.name}': {e}")
-                    continue
-                    
-        except Exception as e:
-            print(f"Error reading Excel file '{workbook.name}': {e}")
-            continue
+    for wb_tables, wb_metadata, wb_warnings in results:
+        warnings.extend(wb_warnings)
+        data_tables.extend(wb_tables)
+        metadata_dfs.update(wb_metadata)
 
     # Step 2: Process data tables with type enforcement
-    schema: Dict[str, List[ColumnInfo]] = {}
+    # Workbooks with a table that failed to load are not cached, so they are retried
+    failed_workbooks: set = set()
+    
+    # Content hashes of previously loaded tables, used to skip identical rewrites
+    con.execute(
+        f"CREATE TABLE IF NOT EXISTS {_LOAD_HASHES_TABLE} (table_name VARCHAR PRIMARY KEY, hash VARCHAR)"
+    )
+    stored_hashes = dict(con.execute(f"SELECT table_name, hash FROM {_LOAD_HASHES_TABLE}").fetchall())
+    file_digests: Dict[Path, str] = {}
     
     print(f"Processing {len(data_tables)} data table(s)...")
     
-    for table_name, df in data_tables:
-        try:
-            metadata_name = table_name + "_"
-            col_metadata: Dict[str, Dict[str, Any]] = {}
-            
-            # Parse metadata if available
-            if metadata_name in metadata_dfs:
-                m_df = metadata_dfs[metadata_name]
-                
-                # Find column headers
-                cols = {c.lower().strip(): c for c in m_df.columns}
-                
-            # Helper to find a column from candidates
-                def get_col_key(candidates: List[str]) -> Optional[str]:
-                    for cand in candidates:
-                        if cand in cols:
-                            return cols[cand]
-                    return None
-                
-                name_col = get_col_key(['field name', 'fieldname', 'name', 'column', 'field'])
-                type_col = get_col_key(['type', 'datatype', 'data type'])
-                desc_col = get_col_key(['description', 'desc', 'definition'])
-                
-                if name_col:
-                    for _, row in m_df.iterrows():
-                        c_name_val = row[name_col]
-                        if pd.isna(c_name_val):
-                            continue
-                        c_name = str(c_name_val).strip()
-                        c_type = str(row[type_col]) if type_col and pd.notna(row[type_col]) else 'VARCHAR'
-                        c_desc = str(row[desc_col]) if desc_col and pd.notna(row[desc_col]) else None
-                        
-                        col_metadata[c_name.lower()] = {
-                            'type': c_type,
-                            'duckdb_type': map_excel_type_to_duckdb(c_type),
-                            'description': c_desc,
-                            'original_name': c_name
-                        }
-
-            # Register raw dataframe as temp view
-            tmp_view = f"tmp_{table_name}"
-            con.register(view_name=tmp_view, python_object=df)
-            
-            # Build CREATE TABLE statement with casting
-            select_parts = []
-            table_columns: List[ColumnInfo] = []
-            
-            for col in df.columns.tolist():
-                col_str = str(col)
-                # Look up metadata (case insensitive)
-                meta = col_metadata.get(col_str.lower())
-                
-                if meta:
-                    duck_type = meta['duckdb_type']
-                    original_type = meta['type']
-                    desc = meta['description']
-                else:
-                    duck_type = 'VARCHAR' # Default fallback
-                    original_type = 'STRING'
-                    desc = None
-                
-                # Double quote column name to handle special chars/keywords
-                safe_col = f'"{col_str}"'
-                
-                # CAST logic: TRY_CAST(col AS TYPE)
-                select_parts.append(f"TRY_CAST({safe_col} AS {duck_type}) AS {safe_col}")
-                
-                table_columns.append({
-                    'name': col_str,
-                    'type': original_type,  # Keep original type for LLM prompt context
-                    'description': desc
-                })
-            
-            # Execute CREATE TABLE with explicit types
-            query = f"CREATE OR REPLACE TABLE {table_name} AS SELECT {', '.join(select_parts)} FROM {tmp_view}"
-            con.execute(query)
-            con.unregister(tmp_view)
-            
-            schema[table_name] = table_columns
-            print(f"Loaded table '{table_name}' with type enforcement ({len(df)} rows)")
-            
-        except Exception as e:
-            print(f"Error creating table '{table_name}': {e}")
+    # Tables are independent: each is cast and written on its own cursor so Arrow
+    # conversion, read_xlsx parsing and DuckDB ingest of different tables overlap
+    load_table = partial(
+        _load_table_on_cursor,
+        con=con,
+        metadata_dfs=metadata_dfs,
+        existing_tables=existing_tables,
+        stored_hashes=stored_hashes,
+        file_digests=file_digests,
+    )
+    outcomes = []
+    if data_tables:
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1, len(data_tables))) as executor:
+            outcomes = list(executor.map(load_table, data_tables))
+    
+    new_hashes: List[Tuple[str, str]] = []
+    dropped: List[Tuple[str]] = []
+    for (table_name, _, workbook, _), (table_columns, content_hash, table_warnings, error) in zip(
+        data_tables, outcomes
+    ):
+        warnings.extend(table_warnings)
+        if error is not None:
+            _warn(warnings, "Error creating table '%s': %s", table_name, error)
+            failed_workbooks.add(workbook)
+            continue
+        if table_columns is None:
+            dropped.append((table_name,))
+            continue
+        schema[table_name] = table_columns
+        if content_hash is not None:
+            new_hashes.append((table_name, content_hash))
+    
+    # Hash bookkeeping is written once, from this thread
+    if new_hashes:
+        con.executemany(f"INSERT OR REPLACE INTO {_LOAD_HASHES_TABLE} VALUES (?, ?)", new_hashes)
+    if dropped:
+        con.executemany(f"DELETE FROM {_LOAD_HASHES_TABLE} WHERE table_name = ?", dropped)
+    
+    # Update the load cache: keep reused entries, record freshly loaded workbooks
+    tables_by_workbook: Dict[Path, List[str]] = {wb: [] for wb in to_read}
+    for table_name, _, workbook, _ in data_tables:
+        tables_by_workbook[workbook].append(table_name)
+    
+    new_cache = {path: load_cache[path] for path in reused}
+    for workbook, table_names in tables_by_workbook.items():
+        if workbook in failed_workbooks:
             continue
+        new_cache[str(workbook)] = {
+            "key": file_keys[str(workbook)],
+            "tables": {t: schema[t] for t in table_names if t in schema},
+        }
+    _write_load_cache(new_cache)
     
-    return schema
+    return schema, warnings
@@ -6,6 +6,8 @@ management, query execution, and analytical function support. It provides
 a safe interface for executing SQL queries generated by the coding agent.
 """
 
+import hashlib
+import threading
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -13,6 +15,9 @@ import duckdb
 
 from config import settings
 
+# Loader bookkeeping table: one content hash per loaded table (see data_loader)
+LOAD_HASHES_TABLE = "__load_hashes"
+
 
 class DuckDBManager:
     """
@@ -49,11 +54,37 @@ class DuckDBManager:
         # Connect to DuckDB (creates database if it doesn't exist)
         self.con = duckdb.connect(database=str(db_path), read_only=False)
         
+        # Per-thread cursors for concurrent queries (see get_cursor), plus every
+        # cursor handed out so that close() can release them
+        self._local = threading.local()
+        self._cursors: List[duckdb.DuckDBPyConnection] = []
+        self._cursors_lock = threading.Lock()
+        
         # Enable extensions for analytical functions
         # The median extension provides MEDIAN() function for statistical analysis
         # self.con.execute("INSTALL median;")
         # self.con.execute("LOAD median;")
 
+    def get_cursor(self) -> duckdb.DuckDBPyConnection:
+        """
+        Return the calling thread's cursor on the database.
+        
+        Statements issued through one connection are serialized; cursors are
+        separate connections to the same database, so queries issued from
+        different threads run in parallel. Each thread reuses its cursor
+        until close() is called.
+        
+        Returns:
+            DuckDB cursor owned by the current thread
+        """
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            cursor = self.con.cursor()
+            self._local.cursor = cursor
+            with self._cursors_lock:
+                self._cursors.append(cursor)
+        return cursor
+
     def load_tables(self, schemas: Dict[str, List[str]]) -> None:
         """
         Hook for schema tracking - tables are loaded via data_loader.
@@ -83,7 +114,9 @@ class DuckDBManager:
         # Allow CTEs (WITH ... SELECT) and SELECT statements
         return sql_clean.startswith("SELECT") or sql_clean.startswith("WITH")
 
-    def validate_schema(self, sql: str) -> Dict[str, Any]:
+    def validate_schema(
+        self, sql: str, con: Optional[duckdb.DuckDBPyConnection] = None
+    ) -> Dict[str, Any]:
         """
         Validate query against the database schema using EXPLAIN.
         
@@ -93,6 +126,41 @@ class DuckDBManager:
         
         Args:
             sql: SQL query to validate
+            con: Optional cursor to run on (e.g. get_cursor()); defaults to the main connection
+            
+        Returns:
+            Dictionary with 'valid' (bool) and 'error' (str) if invalid
+        """
+        # EXPLAIN verifies semantics (binder) without running the heavy query
+        return self._bind(f"EXPLAIN {sql}", sql, con)
+
+    def prepare(self, name: str, sql: str) -> Dict[str, Any]:
+        """
+        Validate a query by preparing it as a named statement.
+        
+        PREPARE binds the query (same error surface as EXPLAIN) and keeps the
+        plan, so a successful validation can be run with execute_prepared()
+        without parsing and binding the SQL a second time.
+        
+        Args:
+            name: Prepared statement name (must be a valid identifier)
+            sql: SQL query to validate and prepare
+            
+        Returns:
+            Dictionary with 'valid' (bool) and 'error' (str) if invalid
+        """
+        return self._bind(f"PREPARE {name} AS {sql}", sql)
+
+    def _bind(
+        self, statement: str, sql: str, con: Optional[duckdb.DuckDBPyConnection] = None
+    ) -> Dict[str, Any]:
+        """
+        Run a statement that binds sql without executing it, mapping errors to feedback.
+        
+        Args:
+            statement: EXPLAIN or PREPARE statement wrapping sql
+            sql: The query being validated
+            con: Connection or cursor to run on (defaults to the main connection)
             
         Returns:
             Dictionary with 'valid' (bool) and 'error' (str) if invalid
@@ -101,8 +169,7 @@ class DuckDBManager:
             return {"valid": False, "error": "Query must be a SELECT statement."}
             
         try:
-            # EXPLAIN verifies semantics (binder) without running the heavy query
-            self.con.execute(f"EXPLAIN {sql}")
+            (con or self.con).execute(statement)
             return {"valid": True}
         except duckdb.BinderException as e:
             return {"valid": False, "error": f"Schema Error: {str(e)}"}
@@ -114,7 +181,9 @@ class DuckDBManager:
             # Catch-all for other DuckDB errors
             return {"valid": False, "error": f"Validation Error: {str(e)}"}
 
-    def query(self, sql: str) -> List[Dict[str, Any]]:
+    def query(
+        self, sql: str, con: Optional[duckdb.DuckDBPyConnection] = None
+    ) -> List[Dict[str, Any]]:
         """
         Execute a SQL query and return results as a list of dictionaries.
         
@@ -133,6 +202,7 @@ class DuckDBManager:
         
         Args:
             sql: SQL query string to execute
+            con: Optional cursor to run on (e.g. get_cursor()); defaults to the main connection
             
         Returns:
             List of dictionaries, where each dictionary represents a row
@@ -154,13 +224,59 @@ class DuckDBManager:
                 "Only read operations are allowed for safety."
             )
         
+        return self._fetch_dicts(sql, con)
+
+    def execute_prepared(self, name: str) -> List[Dict[str, Any]]:
+        """
+        Execute a statement created by prepare() and return its rows.
+        
+        Args:
+            name: Prepared statement name
+            
+        Returns:
+            List of dictionaries, one per row (same shape as query())
+            
+        Raises:
+            RuntimeError: If execution fails
+        """
+        return self._fetch_dicts(f"EXECUTE {name}")
+
+    def deallocate(self, name: str) -> None:
+        """
+        Drop a prepared statement, ignoring statements that no longer exist.
+        
+        Args:
+            name: Prepared statement name
+        """
+        try:
+            self.con.execute(f"DEALLOCATE {name}")
+        except duckdb.Error:
+            pass
+
+    def _fetch_dicts(
+        self, sql: str, con: Optional[duckdb.DuckDBPyConnection] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute a statement and convert its rows to dictionaries.
+        
+        Args:
+            sql: Statement to execute
+            con: Connection or cursor to run on (defaults to the main connection)
+            
+        Returns:
+            List of dictionaries keyed by column name
+            
+        Raises:
+            RuntimeError: If execution fails
+        """
+        con = con or self.con
         try:
             # Execute query and fetch all results
-            result = self.con.execute(sql).fetchall()
+            result = con.execute(sql).fetchall()
             
             # Get column names from query description
-            if self.con.description:
-                columns = [desc[0] for desc in self.con.description]
+            if con.description:
+                columns = [desc[0] for desc in con.description]
                 # Convert rows to dictionaries with column names as keys
                 return [dict(zip(columns, row)) for row in result]
             
@@ -174,6 +290,28 @@ class DuckDBManager:
             # Catch-all for other exceptions
             raise RuntimeError(f"Query execution error: {exc}") from exc
 
+    def data_version(self) -> str:
+        """
+        Fingerprint of the loaded data, for keying caches that hold query results.
+        
+        The loader records a content hash per table in LOAD_HASHES_TABLE and
+        updates it whenever it rewrites or drops a table, so the fingerprint
+        changes with every data reload that changes rows.
+        
+        Returns:
+            Hex digest of the loader's table hashes ("" if nothing was loaded yet)
+        """
+        try:
+            rows = self.con.execute(
+                f"SELECT table_name, hash FROM {LOAD_HASHES_TABLE} ORDER BY table_name"
+            ).fetchall()
+        except duckdb.Error:
+            return ""
+        h = hashlib.blake2b(digest_size=8)
+        for table_name, content_hash in rows:
+            h.update(f"{table_name}\x00{content_hash}\x1f".encode())
+        return h.hexdigest()
+
     def get_table_info(self, table_name: str) -> Optional[Dict[str, Any]]:
         """
         Get information about a specific table.
@@ -199,17 +337,23 @@ class DuckDBManager:
         """
         try:
             result = self.query("SHOW TABLES")
-            return [row["name"] for row in result] if result else []
+            # Tables prefixed with "__" are loader bookkeeping, not user data
+            return [row["name"] for row in result if not row["name"].startswith("__")] if result else []
         except Exception:
             return []
 
     def close(self) -> None:
         """
-        Close the database connection.
+        Close the database connection and every cursor handed out by get_cursor().
         
         This should be called when the database is no longer needed
         to free up resources. The connection is automatically closed
         when the object is garbage collected, but explicit closing is recommended.
         """
+        with self._cursors_lock:
+            cursors, self._cursors = self._cursors, []
+            self._local = threading.local()
+        for cursor in cursors:
+            cursor.close()
         if self.con:
             self.con.close()
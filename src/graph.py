@@ -6,16 +6,79 @@ coding agents. It uses LangGraph to create a directed graph where each node
 represents a step in the question-answering process.
 """
 
-from typing import Annotated, Any, Dict, List, Literal, Optional, TypedDict
+import asyncio
+import hashlib
+import itertools
+import json
+import logging
+import re
+from collections import OrderedDict
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Annotated, Any, AsyncIterator, Callable, Dict, Iterator, List, Literal, Optional, TypedDict
 
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import END, StateGraph
 from langgraph.graph.message import add_messages
 
-from src.agents import CodingAgent, SupervisorAgent, build_coding_config, build_supervisor_config
+from config import settings
+from src.agents import CodingAgent, SupervisorAgent, build_coding_config, build_supervisor_config, run_sync
 from src.db_manager import DuckDBManager
 from src.schema_manager import SchemaManager
 
+logger = logging.getLogger("agentic.graph")
+
+# AgenticGraph whose run()/arun() is executing in the current context. Compiled
+# workflows are shared between instances, so nodes resolve their instance here.
+_ACTIVE_GRAPH: ContextVar["AgenticGraph"] = ContextVar("agentic_active_graph")
+
+
+class PipelineError(Exception):
+    """
+    Raised by a node when its stage fails; ends the run with an error answer.
+    
+    The node wrapper (AgenticGraph._node) turns it into the state update
+    below and the conditional edges route the run straight to END, so later
+    nodes never run with, or need to check for, a failed predecessor.
+    
+    Attributes:
+        stage: Pipeline stage that failed (e.g. "execute")
+    """
+
+    def __init__(self, stage: str, message: str) -> None:
+        super().__init__(message)
+        self.stage = stage
+
+    def as_update(self) -> Dict[str, Any]:
+        """State update recording the failure as the run's error and answer."""
+        return {"error": str(self), "answer": f"I encountered an error: {self}"}
+
+
+async def _guarded(coro: Any) -> Dict[str, Any]:
+    """Await a node coroutine, converting a PipelineError into its state update."""
+    try:
+        return await coro
+    except PipelineError as e:
+        return e.as_update()
+
+
+def _merge_sub_results(
+    left: Optional[List[Dict[str, Any]]], right: Optional[List[Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """
+    Reducer for GraphState.sub_results: appends new sub-results.
+    
+    Nodes emit only the sub-results they produced and the reducer extends
+    the accumulated list. Writing None resets it, which run() does through
+    the input state so a checkpointed thread starts every question empty.
+    """
+    if right is None:
+        return []
+    return (left or []) + right
+
 
 class GraphState(TypedDict):
     """
@@ -36,11 +99,15 @@ class GraphState(TypedDict):
         needs_query: Boolean flag indicating if a query is needed
         query_is_valid: Boolean indicating if the generated query passed verification
         query_feedback: Feedback string if the query was invalid
+        prepared_statement: Name of the DuckDB prepared statement holding the
+            verified query (set by coding node, released by execute node)
         retries: Number of correction attempts
         is_complex: Boolean indicating if question was decomposed
-        sub_questions: List of decomposed sub-questions
-        current_sub_question_index: Current position in sub-question queue
-        sub_results: Accumulated results from sub-question processing
+        sub_questions: Decomposed sub-questions as {"id", "text", "deps"} dicts
+        sub_results: Results of sub-question processing (one per sub-question);
+            nodes return only new entries, which the reducer appends
+    
+    Nodes return partial updates containing only the keys they change.
     """
     # Conversation history - uses add_messages reducer for proper message merging
     messages: Annotated[List[BaseMessage], add_messages]
@@ -55,11 +122,142 @@ class GraphState(TypedDict):
     needs_query: Optional[bool]
     query_is_valid: Optional[bool]
     query_feedback: Optional[str]
+    prepared_statement: Optional[str]
     retries: Optional[int]
     is_complex: Optional[bool]
-    sub_questions: Optional[list[str]]
-    current_sub_question_index: Optional[int]
-    sub_results: Optional[list[Dict[str, Any]]]
+    sub_questions: Optional[list[Dict[str, Any]]]
+    sub_results: Annotated[list[Dict[str, Any]], _merge_sub_results]
+
+
+@dataclass(slots=True)
+class _SubQuestionContext:
+    """
+    Working context of one sub-question inside _process_one.
+    
+    Slotted: one is created per sub-question and its fields are read and
+    written on every retry, so attribute access beats dict lookups and
+    instances carry no per-object __dict__.
+    """
+    id: Any
+    sub_question: str
+    query: Optional[str] = None
+    results: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+    
+    def to_result(self) -> Dict[str, Any]:
+        """
+        Convert to the sub-result dict stored in GraphState.sub_results.
+        
+        Returns:
+            Sub-result dictionary with 'id', 'sub_question', 'query', 'results'
+            and 'error' keys
+        """
+        return {
+            "id": self.id,
+            "sub_question": self.sub_question,
+            "query": self.query,
+            "results": self.results,
+            "error": self.error,
+        }
+
+
+# Values every run starts from; question-specific keys are filled in by run()
+_STATE_DEFAULTS: Dict[str, Any] = {
+    "query": None,
+    "results": None,
+    "answer": None,
+    "error": None,
+    "needs_query": None,
+    "query_is_valid": None,
+    "query_feedback": None,
+    "prepared_statement": None,
+    "retries": 0,
+    # Query expansion fields
+    "is_complex": None,
+    "sub_questions": None,
+    "sub_results": None,  # None resets the sub_results reducer
+}
+
+# Maximum number of idle state dicts kept for reuse
+_STATE_POOL_SIZE = 8
+
+# Maximum number of complexity verdicts remembered per graph
+_COMPLEXITY_CACHE_SIZE = 1024
+
+# Process-wide numbering of prepared statements. Graph instances may share one
+# DuckDBManager, and PREPARE silently replaces a statement of the same name.
+_STATEMENT_IDS = itertools.count()
+
+# Words that suggest a question combines several asks
+_COMPLEX_RE = re.compile(r"\b(and|then|compare|versus|vs\.?|also|plus)\b", re.IGNORECASE)
+
+# Separators of enumerated asks ("volume, growth; value")
+_LIST_SEP_RE = re.compile(r"[,;]")
+
+# Complexity heuristic: words allowed before length counts, and per-feature weights
+_SIMPLE_MAX_WORDS = 8
+_WEIGHT_EXTRA_WORD = 0.03
+_WEIGHT_COMBINING_WORD = 0.35
+_WEIGHT_LIST_SEP = 0.15
+
+# Scores below this are confidently simple and skip the complexity LLM call
+_SIMPLE_SCORE_MAX = 0.3
+
+
+def _open_disk_cache(directory: str, size_mb: int):
+    """
+    Open an on-disk cache.
+    
+    Args:
+        directory: Cache directory (empty string disables the cache)
+        size_mb: Size limit in megabytes
+        
+    Returns:
+        diskcache.Cache evicting least recently used entries beyond size_mb,
+        or None if caching is disabled or diskcache is not installed
+    """
+    if not directory:
+        return None
+    try:
+        import diskcache
+    except ImportError:
+        logger.warning("diskcache not installed. Caching in %s disabled.", directory)
+        return None
+    return diskcache.Cache(
+        directory,
+        size_limit=size_mb * 1024 * 1024,
+        eviction_policy="least-recently-used",
+    )
+
+
+def _bfs_stages(sub_questions: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """
+    Group sub-questions into execution stages by breadth-first walk over "deps".
+    
+    Stage 0 holds the sub-questions without dependencies; each following
+    stage holds those whose dependencies all ran in earlier stages.
+    Sub-questions caught in a dependency cycle are placed in a final stage.
+    
+    Args:
+        sub_questions: Normalized {"id", "text", "deps"} sub-questions
+        
+    Returns:
+        List of stages, each a list of sub-questions in their original order
+    """
+    stages: List[List[Dict[str, Any]]] = []
+    done: set = set()
+    pending = list(sub_questions)
+    
+    while pending:
+        ready = [sq for sq in pending if all(d in done for d in sq["deps"])]
+        if not ready:
+            # Dependency cycle: run the remainder together
+            ready = pending
+        stages.append(ready)
+        done.update(sq["id"] for sq in ready)
+        pending = [sq for sq in pending if sq["id"] not in done]
+    
+    return stages
 
 
 class AgenticGraph:
@@ -72,8 +270,15 @@ class AgenticGraph:
     3. If no query needed → Supervisor provides direct answer
     
     The graph uses conditional edges to route based on the supervisor's decision.
+    The workflow is built once per class and shared by all instances, each of
+    which compiles it with its own checkpointer; nodes act on the instance
+    whose run()/arun() is executing.
     """
 
+    # Uncompiled workflows shared by all instances, keyed by class. The schema
+    # reaches nodes through state, so it is not part of the key.
+    _WORKFLOW_CACHE: Dict[type, StateGraph] = {}
+
     def __init__(self, schema_manager: SchemaManager, db: DuckDBManager, checkpointer=None) -> None:
         """
         Initialize the graph with dependencies.
@@ -89,32 +294,61 @@ class AgenticGraph:
         self.max_retries = 3
         self.checkpointer = checkpointer
         
+        # Answer empty and single-value results locally instead of asking the LLM;
+        # disable for natural-language phrasing of every answer
+        self.cheap_synth = True
+        
+        # Free list of input state dicts reused across runs (see _pooled_state)
+        self._state_pool: List[Dict[str, Any]] = []
+        
+        # Schema summary is rendered once and shared by every run (see refresh_schema)
+        self._schema_summary = self.schema_manager.describe()
+        self._schema_hash = self.schema_manager.fingerprint()
+        # Version of the loaded rows; cached answers must not outlive a data reload
+        self._data_version = self.db.data_version()
+        
+        # detect_complexity verdicts per (question, schema), least recently used evicted
+        self._complexity_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        
         # Initialize agents with their configurations
         supervisor_cfg = build_supervisor_config()
         coding_cfg = build_coding_config()
         self.supervisor = SupervisorAgent(supervisor_cfg)
         self.coder = CodingAgent(coding_cfg)
         
-        # Build and compile the LangGraph workflow
-        self.graph = self._build_graph()
+        # Final answers are cached per (question, schema, models)
+        self._model_signature = f"{supervisor_cfg.signature()}|{coding_cfg.signature()}"
+        self._answer_cache = _open_disk_cache(settings.answer_cache_dir, settings.answer_cache_size_mb)
+        
+        # Sub-question (query, results) pairs are cached per (sub-question, schema)
+        self._subq_cache = _open_disk_cache(settings.subquery_cache_dir, settings.subquery_cache_size_mb)
+        
+        # Reuse the LangGraph workflow (built on first use). It is compiled per
+        # instance so that no checkpointer, or the connection pool it owns,
+        # outlives the graphs using it.
+        workflow = AgenticGraph._WORKFLOW_CACHE.get(type(self))
+        if workflow is None:
+            workflow = AgenticGraph._WORKFLOW_CACHE[type(self)] = self._build_graph()
+        self.graph = workflow.compile(checkpointer=self.checkpointer)
 
-    def _supervisor_node(self, state: GraphState) -> GraphState:
+    async def _supervisor_node(self, state: GraphState) -> Dict[str, Any]:
         """
         Supervisor node: Analyzes the question and determines if query is needed.
         
         This is the entry point of the graph. The supervisor agent analyzes
         the user's question and decides whether a database query is required
-        to answer it.
+        to answer it. Complexity detection is left to the expansion node, so
+        conversational (NO_QUERY) turns cost a single LLM call.
         
         Args:
             state: Current graph state
             
         Returns:
-            Updated state with needs_query flag set and potentially an answer
+            State update with needs_query flag set and potentially an answer
         """
         try:
             # Ask supervisor to analyze the question
-            analysis = self.supervisor.analyze_question(
+            analysis = await self.supervisor.analyze_question_async(
                 question=state["question"],
                 schema_info=state["schema_info"]
             )
@@ -124,132 +358,132 @@ class AgenticGraph:
             
             # If no query needed, supervisor can provide direct answer
             if not needs_query:
-                state["answer"] = analysis
-                state["needs_query"] = False
-            else:
-                state["needs_query"] = True
-                state["retries"] = 0  # Initialize retry counter
-            
-            return state
+                return {"answer": analysis, "needs_query": False}
+            return {"needs_query": True}
             
         except Exception as e:
-            # Handle errors in supervisor analysis
-            state["error"] = f"Supervisor error: {e}"
-            state["needs_query"] = False
-            return state
+            raise PipelineError("supervisor", f"Supervisor error: {e}") from e
 
-    def _coding_node(self, state: GraphState) -> GraphState:
+    async def _coding_with_verify_node(self, state: GraphState) -> Dict[str, Any]:
         """
-        Coding node: Generates SQL query from the question.
+        Coding node: Generates a SQL query and self-corrects it until it verifies.
         
-        This node uses the coding agent to translate the natural language
-        question into a SQL query that can be executed against DuckDB.
+        The coding agent drafts the query, DuckDB's PREPARE deterministically
+        catches Binder Errors (hallucinated columns/tables), and the agent
+        repairs the query within the same conversation, up to max_retries
+        times, without round-tripping through the graph. The successfully
+        prepared statement is reused by the execute node.
         
         Args:
             state: Current graph state (must have question and schema_info)
             
         Returns:
-            Updated state with generated SQL query
+            State update with the generated query and its verification outcome
         """
         try:
-            feedback = state.get("query_feedback")
-            if feedback:
-                print(f"--- RETRYING QUERY GENERATION (Feedback: {feedback}) ---")
-            else:
-                print("--- GENERATING INITIAL QUERY ---")
-
-            # Ask coding agent to generate SQL query, passing feedback and previous query if any
-            query = self.coder.generate_query(
+            logger.info("--- GENERATING QUERY ---")
+            statement = f"agentic_stmt_{next(_STATEMENT_IDS)}"
+            outcome = await self.coder.generate_verified_query_async(
                 question=state["question"],
                 schema_info=state["schema_info"],
-                feedback=feedback,
-                previous_query=state.get("query") if feedback else None
+                validator=partial(self.db.prepare, statement),
+                max_retries=self.max_retries,
             )
             
-            # Store the generated query in state
-            state["query"] = query
-            return state
+            if outcome["valid"]:
+                logger.info("✅ Verification PASSED (attempt %d/%d)", outcome["attempts"], self.max_retries + 1)
+            else:
+                # Run it anyway and let the execute node report the error
+                logger.warning("❌ Verification FAILED after %d attempts: %s", outcome["attempts"], outcome["feedback"])
+            
+            return {
+                "query": outcome["query"],
+                "query_is_valid": outcome["valid"],
+                "query_feedback": outcome["feedback"],
+                # Only a query the validator accepted was actually prepared
+                "prepared_statement": statement if outcome["valid"] and outcome["checked"] else None,
+                "retries": outcome["attempts"] - 1,
+            }
             
         except Exception as e:
-            # Handle errors in query generation - increment retries to prevent infinite loop
-            state["error"] = f"Query generation error: {e}"
-            current_retries = state.get("retries", 0)
-            state["retries"] = current_retries + 1
-            print(f"⚠️ Query generation error (attempt {state['retries']}/{self.max_retries + 1}): {e}")
-            return state
+            raise PipelineError("coding", f"Query generation error: {e}") from e
 
-    def _execute_node(self, state: GraphState) -> GraphState:
+    def _execute_node(self, state: GraphState) -> Dict[str, Any]:
         """
         Execute node: Runs the SQL query in DuckDB.
         
         This node takes the generated SQL query and executes it against
-        the DuckDB database, storing the results in the state.
+        the DuckDB database, storing the results in the state. A verified
+        query runs from its prepared statement (no second parse/bind).
         
         Args:
             state: Current graph state (must have query)
             
         Returns:
-            Updated state with query results
+            State update with query results
         """
-        # Skip execution if there's already an error from previous nodes
-        if state.get("error"):
-            return state
-        
+        statement = state.get("prepared_statement")
         try:
             # Validate that a query exists
             if not state.get("query"):
-                state["error"] = "No query to execute"
-                return state
+                raise PipelineError("execute", "No query to execute")
             
             # Execute the query and store results
-            results = self.db.query(state["query"])
-            state["results"] = results
-            return state
+            if statement:
+                results = self.db.execute_prepared(statement)
+            else:
+                results = self.db.query(state["query"])
+            return {"results": results, "prepared_statement": None}
             
+        except PipelineError:
+            raise
         except Exception as e:
-            # Handle query execution errors
-            state["error"] = f"Query execution error: {e}"
-            return state
+            raise PipelineError("execute", f"Query execution error: {e}") from e
+        finally:
+            if statement:
+                self.db.deallocate(statement)
 
-    def _synthesize_node(self, state: GraphState) -> GraphState:
+    async def _synthesize_node(self, state: GraphState) -> Dict[str, Any]:
         """
         Synthesize node: Creates final natural language answer from results.
         
         This node uses the supervisor agent to synthesize a clear, natural
         language answer from the query results. It combines the original
         question, the SQL query, and the results into a coherent response.
+        With cheap_synth enabled, empty and single-value results are answered
+        from a template without an LLM call.
         
         Args:
             state: Current graph state (must have question, query, and results)
             
         Returns:
-            Updated state with final answer
+            State update with final answer
         """
         try:
-            # If there's an error, include it in the answer
-            if state.get("error"):
-                state["answer"] = f"I encountered an error: {state['error']}"
-                return state
+            # Empty and 1x1 results need no LLM round-trip to phrase
+            results = state.get("results") or []
+            if self.cheap_synth:
+                if not results:
+                    return {"answer": "The query returned no results."}
+                if len(results) == 1 and len(results[0]) == 1:
+                    column, value = next(iter(results[0].items()))
+                    return {"answer": f"{column}: {value}"}
             
             # Ask supervisor to synthesize answer from results
-            answer = self.supervisor.synthesize_answer(
+            answer = await self.supervisor.synthesize_answer_async(
                 question=state["question"],
                 query=state.get("query", ""),
-                results=state.get("results", []),
+                results=results,
                 schema_info=state["schema_info"]
             )
             
-            # Store the synthesized answer
-            state["answer"] = answer
-            return state
+            return {"answer": answer}
             
         except Exception as e:
-            # Handle synthesis errors
-            state["error"] = f"Synthesis error: {e}"
-            state["answer"] = f"I encountered an error while synthesizing the answer: {e}"
-            return state
+            raise PipelineError("synthesize", f"Synthesis error: {e}") from e
 
-    def _should_query(self, state: GraphState) -> Literal["query", "end"]:
+    @staticmethod
+    def _should_query(state: GraphState) -> Literal["query", "end"]:
         """
         Conditional edge function: Determines routing after supervisor node.
         
@@ -266,162 +500,215 @@ class AgenticGraph:
             return "query"
         return "end"
 
-    def _verify_node(self, state: GraphState) -> GraphState:
-        """
-        Verification node: Checks the generated SQL against the actual database schema.
-        
-        This uses DuckDB's EXPLAIN command to deterministically catch Binder Errors
-        (hallucinated columns/tables) before execution.
-        """
-        # Handle error from coding node - still need to increment retries
-        if state.get("error"):
-            current_retries = state.get("retries", 0)
-            # Only increment if we haven't already in the coding node
-            if current_retries <= self.max_retries:
-                print(f"⚠️ Skipping verification due to error: {state['error']}")
-            state["query_is_valid"] = False
-            state["query_feedback"] = state.get("error", "Unknown error")
-            # Clear the error so we can retry
-            state["error"] = None
-            return state
-            
-        try:
-            print(f"--- VERIFYING QUERY (Attempt {state.get('retries', 0) + 1}/{self.max_retries + 1}) ---")
-            # Deterministic check using DuckDB engine
-            verification = self.db.validate_schema(state["query"])
-            
-            state["query_is_valid"] = verification.get("valid", True)
-            state["query_feedback"] = verification.get("error", "")
-            
-            if not state["query_is_valid"]:
-                print(f"❌ Verification FAILED: {state['query_feedback']}")
-                # Increment retries if invalid
-                current_retries = state.get("retries", 0)
-                state["retries"] = current_retries + 1
-            else:
-                print("✅ Verification PASSED")
-                
-            return state
-            
-        except Exception as e:
-            # If verification fails unexpectedly, we log it
-            print(f"⚠️ Verification System Error: {e}")
-            state["query_is_valid"] = True # Fail open to avoid deadlock
-            state["query_feedback"] = f"Verification system error: {e}"
-            return state
-
-    def _check_verification(self, state: GraphState) -> Literal["execute", "retry_coding"]:
-        """
-        Route after verification.
-        If valid -> execute.
-        If invalid -> retry coding (coding node handles feedback).
-        """
-        if state.get("query_is_valid"):
-            return "execute"
-        
-        # Check max retries
-        if state.get("retries", 0) >= self.max_retries:
-            # Give up and try to run it anyway, or fail gracefully
-            # Let's run it and let the execute node handle the error if it fails
-            return "execute"
-            
-        return "retry_coding"
-
     # ==================== QUERY EXPANSION NODES ====================
 
-    def _expansion_node(self, state: GraphState) -> GraphState:
+    async def _expansion_node(self, state: GraphState) -> Dict[str, Any]:
         """
         Expansion node: Analyzes question complexity and decomposes if needed.
         
         This node uses the supervisor agent to determine if the question
-        should be broken down into simpler sub-questions.
+        should be broken down into simpler sub-questions. Verdicts are
+        remembered per (question, schema) so repeated questions skip the call.
         """
+        if self._trivially_simple(state["question"]):
+            logger.info("📝 Short single-ask question - skipping complexity analysis")
+            return {"is_complex": False}
+        
         try:
-            print("--- ANALYZING QUESTION COMPLEXITY ---")
-            result = self.supervisor.detect_complexity(
-                question=state["question"],
-                schema_info=state["schema_info"]
-            )
-            
-            state["is_complex"] = result.get("is_complex", False)
-            state["original_question"] = result.get("original_question", state["question"])
-            
-            if state["is_complex"]:
-                state["sub_questions"] = result.get("sub_questions", [])
-                state["current_sub_question_index"] = 0
-                state["sub_results"] = []
-                print(f"✂️ Question decomposed into {len(state['sub_questions'])} sub-questions:")
-                for i, sq in enumerate(state["sub_questions"], 1):
-                    print(f"   {i}. {sq}")
+            logger.info("--- ANALYZING QUESTION COMPLEXITY ---")
+            cache_key = self._complexity_key(state["question"])
+            result = self._complexity_cache.get(cache_key)
+            if result is not None:
+                self._complexity_cache.move_to_end(cache_key)
+            else:
+                result = await self.supervisor.detect_complexity_async(
+                    question=state["question"],
+                    schema_info=state["schema_info"]
+                )
+                self._remember_complexity(cache_key, result)
+            
+            # original_question is already set by run()'s input state
+            update: Dict[str, Any] = {"is_complex": result.get("is_complex", False)}
+            
+            if update["is_complex"]:
+                update["sub_questions"] = result.get("sub_questions", [])
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("✂️ Question decomposed into %d sub-questions:", len(update["sub_questions"]))
+                    for sq in update["sub_questions"]:
+                        deps = f" (depends on {', '.join(map(str, sq['deps']))})" if sq["deps"] else ""
+                        logger.info("   %s. %s%s", sq["id"], sq["text"], deps)
             else:
-                print("📝 Simple question - no decomposition needed")
+                logger.info("📝 Simple question - no decomposition needed")
                 reasoning = result.get("reasoning", "")
                 if reasoning:
-                    print(f"   Reason: {reasoning}")
+                    logger.info("   Reason: %s", reasoning)
             
-            return state
+            return update
             
         except Exception as e:
-            print(f"⚠️ Expansion error: {e}")
-            state["is_complex"] = False
-            return state
+            logger.warning("⚠️ Expansion error: %s", e)
+            return {"is_complex": False}
+
+    def _complexity_key(self, question: str) -> str:
+        """Build the complexity cache key for a question against the current schema."""
+        return hashlib.blake2b(f"{question}\x00{self._schema_hash}".encode(), digest_size=16).hexdigest()
+
+    def _remember_complexity(self, cache_key: str, result: Dict[str, Any]) -> None:
+        """Cache a complexity verdict, evicting the least recently used one beyond the limit."""
+        # Failed analyses are retried next time rather than cached
+        if "error" in result:
+            return
+        self._complexity_cache[cache_key] = result
+        if len(self._complexity_cache) > _COMPLEXITY_CACHE_SIZE:
+            self._complexity_cache.popitem(last=False)
 
-    def _sub_question_node(self, state: GraphState) -> GraphState:
+    @staticmethod
+    def _complexity_score(question: str) -> float:
         """
-        Sub-question node: Prepares the current sub-question for processing.
+        Heuristic complexity score of a question (0 = plainly single-ask).
         
-        This node sets up the state for the coding agent to process
-        the current sub-question from the queue.
+        Combines the question's length beyond _SIMPLE_MAX_WORDS words, the
+        number of combining words ("and", "compare", "vs", ...) and the
+        number of list separators, each with a fixed weight.
         """
-        idx = state.get("current_sub_question_index", 0)
-        sub_questions = state.get("sub_questions", [])
-        
-        if idx < len(sub_questions):
-            current_sub_q = sub_questions[idx]
-            print(f"\n--- PROCESSING SUB-QUESTION {idx + 1}/{len(sub_questions)} ---")
-            print(f"   \"{current_sub_q}\"")
-            
-            # Override question with current sub-question
-            state["question"] = current_sub_q
-            # Reset ALL query-related state for new generation (prevent leakage)
-            state["query"] = None
-            state["results"] = None
-            state["query_is_valid"] = None
-            state["query_feedback"] = None
-            state["error"] = None  # Clear any error from previous sub-question
-            state["retries"] = 0
-        
-        return state
+        extra_words = max(0, len(question.split()) - _SIMPLE_MAX_WORDS)
+        return (
+            extra_words * _WEIGHT_EXTRA_WORD
+            + len(_COMPLEX_RE.findall(question)) * _WEIGHT_COMBINING_WORD
+            + len(_LIST_SEP_RE.findall(question)) * _WEIGHT_LIST_SEP
+        )
 
-    def _collect_result_node(self, state: GraphState) -> GraphState:
+    @staticmethod
+    def _trivially_simple(question: str) -> bool:
         """
-        Collect result node: Stores the current sub-question result and advances queue.
+        Cheap prefilter: True when the complexity score is confidently low.
         
-        This node saves the query and results for the current sub-question,
-        then increments the index to move to the next sub-question.
+        Such questions ("count users") cannot usefully be decomposed, so the
+        complexity LLM call is skipped for them. Everything else, including
+        clearly complex questions (which still need the LLM to produce
+        sub-questions), goes to detect_complexity.
         """
-        idx = state.get("current_sub_question_index", 0)
-        sub_questions = state.get("sub_questions", [])
+        return AgenticGraph._complexity_score(question) < _SIMPLE_SCORE_MAX
+
+    async def _process_one(
+        self,
+        sub_question: Dict[str, Any],
+        dep_results: List[Dict[str, Any]],
+        schema_info: str,
+    ) -> Dict[str, Any]:
+        """
+        Run coding with verification, then execute, for a single sub-question.
+        
+        Drafting and EXPLAIN-checking happen in one coding-agent conversation
+        (generate_verified_query_async), the same loop as the simple path's
+        coding_with_verify node. Each sub-question works in its own local
+        context, so retries never leak between concurrently processed
+        sub-questions.
+        A (query, results) pair cached for the same sub-question, schema and
+        data version skips all three steps.
         
-        if idx < len(sub_questions):
-            sub_result = {
-                "sub_question": sub_questions[idx],
-                "query": state.get("query"),
-                "results": state.get("results", []),
-            }
-            
-            if state.get("sub_results") is None:
-                state["sub_results"] = []
-            state["sub_results"].append(sub_result)
-            
-            print(f"✅ Collected result for sub-question {idx + 1}")
+        Args:
+            sub_question: {"id", "text", "deps"} sub-question to answer
+            dep_results: Sub-results of the sub-questions it depends on
+            schema_info: Schema description for agent context
             
-            # Advance to next sub-question
-            state["current_sub_question_index"] = idx + 1
+        Returns:
+            Sub-result dictionary with 'id', 'sub_question', 'query', 'results'
+            and 'error' keys
+        """
+        context = _SubQuestionContext(id=sub_question["id"], sub_question=sub_question["text"])
+        
+        # Give the coding agent the results this sub-question builds on
+        question = sub_question["text"]
+        if dep_results:
+            question += "\n\nResults of the sub-questions this one depends on:\n" + "\n".join(
+                f"- {dr['sub_question']}: "
+                f"{json.dumps((dr.get('results') or [])[:20], default=str, ensure_ascii=False)[:500]}"
+                for dr in dep_results
+            )
+        
+        # Cached pairs hold row data, so the key includes the data version
+        subq_key = hashlib.blake2b(
+            f"{question}\x00{self._schema_hash}\x00{self._data_version}".encode(), digest_size=16
+        ).hexdigest()
+        if self._subq_cache is not None:
+            cached = self._subq_cache.get(subq_key)
+            if cached is not None:
+                logger.info("♻️ Sub-question %s answered from cache", sub_question["id"])
+                context.query = cached["query"]
+                context.results = cached["results"]
+                return context.to_result()
+        
+        # Draft and EXPLAIN-check in one conversation; the validator runs in a
+        # worker thread on that thread's cursor (DuckDB is synchronous)
+        try:
+            draft = await self.coder.generate_verified_query_async(
+                question=question,
+                schema_info=schema_info,
+                validator=lambda sql: self.db.validate_schema(sql, self.db.get_cursor()),
+                max_retries=self.max_retries,
+            )
+        except Exception as e:
+            context.error = f"Query generation error: {e}"
+            return context.to_result()
+        context.query = draft["query"]
+        
+        # Like the sequential path, run the last query even if it never verified
+        if not context.query:
+            context.error = draft["feedback"] or "No query generated"
+            return context.to_result()
         
-        return state
+        try:
+            context.results = await asyncio.to_thread(
+                lambda: self.db.query(context.query, self.db.get_cursor())
+            )
+        except Exception as e:
+            context.error = f"Query execution error: {e}"
+            return context.to_result()
+        
+        if self._subq_cache is not None:
+            self._subq_cache.set(subq_key, {"query": context.query, "results": context.results})
+        return context.to_result()
 
-    def _aggregation_node(self, state: GraphState) -> GraphState:
+    async def _staged_execute_node(self, state: GraphState) -> Dict[str, Any]:
+        """
+        Staged execute node: Processes sub-questions stage by stage.
+        
+        Sub-questions are grouped into dependency stages (see _bfs_stages).
+        Independent sub-questions within a stage run concurrently with
+        asyncio.gather; a stage starts once all earlier stages are done, so
+        dependent sub-questions can use their prerequisites' results.
+        """
+        sub_questions = state.get("sub_questions") or []
+        stages = _bfs_stages(sub_questions)
+        logger.info("--- PROCESSING %d SUB-QUESTIONS IN %d STAGE(S) ---", len(sub_questions), len(stages))
+        
+        # Preallocated in decomposition order; each result is written by index
+        position = {sq["id"]: i for i, sq in enumerate(sub_questions)}
+        sub_results: List[Optional[Dict[str, Any]]] = [None] * len(sub_questions)
+        for n, stage in enumerate(stages, 1):
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("   Stage %d: sub-question(s) %s", n, ", ".join(str(sq["id"]) for sq in stage))
+            stage_results = await asyncio.gather(*(
+                self._process_one(
+                    sq,
+                    [sub_results[position[d]] for d in sq["deps"] if sub_results[position[d]] is not None],
+                    state["schema_info"],
+                )
+                for sq in stage
+            ))
+            
+            for sq, sub_result in zip(stage, stage_results):
+                sub_results[position[sq["id"]]] = sub_result
+                if sub_result["error"]:
+                    logger.warning("⚠️ Sub-question %s failed: %s", sq["id"], sub_result["error"])
+                else:
+                    logger.info("✅ Collected result for sub-question %s", sq["id"])
+        
+        # Decomposition order is kept; the aggregator refers to results by id
+        return {"sub_results": sub_results}
+
+    async def _aggregation_node(self, state: GraphState) -> Dict[str, Any]:
         """
         Aggregation node: Combines all sub-question results into final answer.
         
@@ -429,30 +716,37 @@ class AgenticGraph:
         answer from all the partial results.
         """
         try:
-            print("\n--- AGGREGATING SUB-QUESTION RESULTS ---")
+            logger.info("--- AGGREGATING SUB-QUESTION RESULTS ---")
             
-            sub_results = state.get("sub_results", [])
+            # Slots of sub-questions that never ran stay None
+            sub_results = [sr for sr in state.get("sub_results") or [] if sr is not None]
             if not sub_results:
-                state["answer"] = "No results to aggregate."
-                return state
+                return {"answer": "No results to aggregate."}
             
-            print(f"   Combining {len(sub_results)} partial results...")
+            logger.info("   Combining %d partial results...", len(sub_results))
             
-            answer = self.supervisor.aggregate_results(
+            answer = await self.supervisor.aggregate_results_async(
                 original_question=state.get("original_question", state["question"]),
                 sub_results=sub_results,
                 schema_info=state["schema_info"]
             )
             
-            state["answer"] = answer
-            return state
+            return {"answer": answer}
             
         except Exception as e:
-            state["error"] = f"Aggregation error: {e}"
-            state["answer"] = f"I encountered an error while aggregating results: {e}"
-            return state
+            raise PipelineError("aggregation", f"Aggregation error: {e}") from e
+
+    @staticmethod
+    def _check_failed(state: GraphState) -> Literal["ok", "failed"]:
+        """
+        Route after a simple-path node: a PipelineError ends the run.
+        """
+        if state.get("error") is not None:
+            return "failed"
+        return "ok"
 
-    def _check_complexity(self, state: GraphState) -> Literal["expand", "simple"]:
+    @staticmethod
+    def _check_complexity(state: GraphState) -> Literal["expand", "simple"]:
         """
         Route after expansion node based on question complexity.
         """
@@ -460,18 +754,41 @@ class AgenticGraph:
             return "expand"
         return "simple"
 
-    def _has_more_sub_questions(self, state: GraphState) -> Literal["more", "aggregate"]:
+    @staticmethod
+    def _node(func: Callable[..., Any]) -> RunnableLambda:
         """
-        Route after collecting a sub-question result.
-        Check if there are more sub-questions to process.
+        Wrap an (unbound) node method for registration in the shared workflow.
+        
+        The node runs on the AgenticGraph active in the current context. Async
+        nodes run under both graph.invoke and graph.astream: async execution
+        awaits the node directly, synchronous execution runs it on the shared
+        agent event loop (see run_sync). A PipelineError raised by the node
+        becomes its error state update.
         """
-        idx = state.get("current_sub_question_index", 0)
-        sub_questions = state.get("sub_questions", [])
+        if not asyncio.iscoroutinefunction(func):
+            def sync_node(state: GraphState) -> Dict[str, Any]:
+                try:
+                    return func(_ACTIVE_GRAPH.get(), state)
+                except PipelineError as e:
+                    return e.as_update()
+            
+            return RunnableLambda(sync_node)
+        
+        async def afunc(state: GraphState) -> Dict[str, Any]:
+            return await _guarded(func(_ACTIVE_GRAPH.get(), state))
         
-        if idx < len(sub_questions):
-            return "more"
-        return "aggregate"
+        return RunnableLambda(lambda state: run_sync(_guarded(func(_ACTIVE_GRAPH.get(), state))), afunc=afunc)
 
+    @contextmanager
+    def _activated(self) -> Iterator[None]:
+        """Make this instance the one the shared workflow's nodes act on."""
+        token = _ACTIVE_GRAPH.set(self)
+        try:
+            yield
+        finally:
+            # An abandoned async generator may be finalized in another context
+            with suppress(ValueError):
+                _ACTIVE_GRAPH.reset(token)
 
     def _build_graph(self) -> StateGraph:
         """
@@ -479,25 +796,25 @@ class AgenticGraph:
         
         This method constructs the state machine with query expansion support:
         - supervisor → expansion → [complex?] → expand path or simple path
-        - expand path: sub_question → coding → verify → execute → collect → [more?] → loop or aggregate
-        - simple path: coding → verify → execute → synthesize
+        - expand path: staged_execute → aggregation
+        - simple path: coding_with_verify → execute → synthesize
         
         Returns:
-            Compiled LangGraph workflow ready to execute
+            Uncompiled LangGraph workflow, to be compiled with a checkpointer
         """
         # Create a new StateGraph with our state schema
         workflow = StateGraph(GraphState)
         
-        # Add all nodes to the graph
-        workflow.add_node("supervisor", self._supervisor_node)
-        workflow.add_node("expansion", self._expansion_node)
-        workflow.add_node("sub_question", self._sub_question_node)
-        workflow.add_node("coding", self._coding_node)
-        workflow.add_node("verify", self._verify_node)
-        workflow.add_node("execute", self._execute_node)
-        workflow.add_node("collect", self._collect_result_node)
-        workflow.add_node("aggregation", self._aggregation_node)
-        workflow.add_node("synthesize", self._synthesize_node)
+        # Add all nodes to the graph (unbound: the workflow is shared by instances)
+        # LLM-bound nodes are async so their Ollama calls overlap under astream
+        cls = type(self)
+        workflow.add_node("supervisor", self._node(cls._supervisor_node))
+        workflow.add_node("expansion", self._node(cls._expansion_node))
+        workflow.add_node("coding_with_verify", self._node(cls._coding_with_verify_node))
+        workflow.add_node("execute", self._node(cls._execute_node))
+        workflow.add_node("staged_execute", self._node(cls._staged_execute_node))
+        workflow.add_node("aggregation", self._node(cls._aggregation_node))
+        workflow.add_node("synthesize", self._node(cls._synthesize_node))
         
         # Set the entry point (where the graph starts)
         workflow.set_entry_point("supervisor")
@@ -512,109 +829,182 @@ class AgenticGraph:
             }
         )
         
-        # Expansion → [complex?] → sub_question OR coding (simple path)
+        # Expansion → [complex?] → staged_execute OR coding_with_verify (simple path)
         workflow.add_conditional_edges(
             "expansion",
             self._check_complexity,
             {
-                "expand": "sub_question",
-                "simple": "coding",
+                "expand": "staged_execute",
+                "simple": "coding_with_verify",
             }
         )
         
-        # Sub-question preparation → Coding
-        workflow.add_edge("sub_question", "coding")
-        
-        # Coding → Verify
-        workflow.add_edge("coding", "verify")
+        # Staged sub-question execution → Aggregation
+        workflow.add_edge("staged_execute", "aggregation")
         
-        # Verify → [valid?] → Execute OR Retry Coding
+        # Coding (with in-agent verification and retries) → Execute OR end on failure
         workflow.add_conditional_edges(
-            "verify",
-            self._check_verification,
+            "coding_with_verify",
+            self._check_failed,
             {
-                "execute": "execute",
-                "retry_coding": "coding",
+                "ok": "execute",
+                "failed": END,
             }
         )
         
-        # Execute → [is_complex?] → collect (for aggregation) OR synthesize (simple path)
+        # Execute → Synthesize (simple path) OR end on failure
         workflow.add_conditional_edges(
             "execute",
-            lambda state: "collect" if state.get("is_complex") else "synthesize",
+            self._check_failed,
             {
-                "collect": "collect",
-                "synthesize": "synthesize",
-            }
-        )
-        
-        # Collect → [more sub-questions?] → sub_question OR aggregation
-        workflow.add_conditional_edges(
-            "collect",
-            self._has_more_sub_questions,
-            {
-                "more": "sub_question",
-                "aggregate": "aggregation",
+                "ok": "synthesize",
+                "failed": END,
             }
         )
         
         # Aggregation → End
         workflow.add_edge("aggregation", END)
         
-        # Synthesize → End (simple path)
+        # Synthesize → End
         workflow.add_edge("synthesize", END)
         
-        # Compile and return the graph (with checkpointer if provided)
-        return workflow.compile(checkpointer=self.checkpointer)
+        return workflow
+
+    @contextmanager
+    def _pooled_state(self) -> Iterator[Dict[str, Any]]:
+        """
+        Borrow an empty dict for the graph's input state.
+        
+        LangGraph copies input values into its channels, so the dict itself
+        is free again once invoke() returns; it is cleared and put back on
+        the pool instead of being reallocated for the next run.
+        
+        Yields:
+            Empty dictionary to populate with the initial state
+        """
+        try:
+            state = self._state_pool.pop()
+        except IndexError:
+            state = {}
+        try:
+            yield state
+        finally:
+            state.clear()
+            if len(self._state_pool) < _STATE_POOL_SIZE:
+                self._state_pool.append(state)
 
-    def run(self, question: str, config: Optional[Dict[str, Any]] = None) -> GraphState:
+    def refresh_schema(self) -> None:
+        """
+        Re-render the schema summary after the schema manager or data changed.
+        
+        The summary and data version are computed once at construction; call
+        this after schema_manager.update(), load_from_file() or reloading
+        tables on a live graph.
+        """
+        self._schema_summary = self.schema_manager.describe()
+        self._schema_hash = self.schema_manager.fingerprint()
+        self._data_version = self.db.data_version()
+        self._complexity_cache.clear()
+
+    def _answer_cache_key(self, question: str) -> str:
+        """Build the answer cache key for a question against the current schema, data and models."""
+        payload = "\x00".join((question, self._schema_hash, self._data_version, self._model_signature))
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def _fill_initial_state(self, state: Dict[str, Any], question: str) -> None:
+        """Populate an empty input state for a new question."""
+        state.update(_STATE_DEFAULTS)
+        state["messages"] = [HumanMessage(content=question)]
+        state["question"] = question
+        state["original_question"] = question  # Preserved for aggregation
+        state["schema_info"] = self._schema_summary
+
+    async def arun(
+        self, question: str, config: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the graph with a user question, streaming node updates as they happen.
+        
+        Unlike run(), this yields each node's state update as soon as the node
+        finishes (e.g. {"synthesize": {"answer": ...}}), so callers can render
+        progress and partial answers. Node LLM calls are awaited on the
+        caller's event loop, through agent clients bound to that loop, so
+        run() and arun() can be mixed. The answer cache is not consulted.
+        
+        Args:
+            question: User's natural language question
+            config: Optional config dict with 'configurable' containing 'thread_id'.
+                   Requires an async-capable checkpointer when the graph has one.
+            
+        Yields:
+            Dictionaries mapping the node name to the state update it returned
+        """
+        with self._pooled_state() as initial_state, self._activated():
+            self._fill_initial_state(initial_state, question)
+            async for event in self.graph.astream(initial_state, config, stream_mode="updates"):
+                yield event
+
+    def run(
+        self,
+        question: str,
+        config: Optional[Dict[str, Any]] = None,
+        bypass_cache: bool = False,
+    ) -> GraphState:
         """
         Run the graph with a user question.
         
         This is the main entry point for processing questions. It:
-        1. Gets schema information from the schema manager
+        1. Uses the schema summary cached at construction
         2. Creates initial state with the question
-        3. Invokes the graph workflow
-        4. Returns the final state with the answer
+        3. Returns a cached final state for a repeated question, if any
+        4. Otherwise invokes the graph workflow (and caches a successful answer)
+        5. Returns the final state with the answer
         
         Args:
             question: User's natural language question
             config: Optional config dict with 'configurable' containing 'thread_id'
                    for memory persistence. Use MemoryManager.get_config() to create.
+            bypass_cache: If True, ignore any cached answer and regenerate it
             
         Returns:
             Final graph state containing the answer (or error)
         """
-        # Get schema summary for agent context
-        schema_summary = self.schema_manager.describe()
-        
-        # Create initial state with user message
-        initial_state: GraphState = {
-            "messages": [HumanMessage(content=question)],
-            "question": question,
-            "original_question": question,  # Preserved for aggregation
-            "schema_info": schema_summary,
-            "query": None,
-            "results": None,
-            "answer": None,
-            "error": None,
-            "needs_query": None,
-            "query_is_valid": None,
-            "query_feedback": None,
-            "retries": 0,
-            # Query expansion fields
-            "is_complex": None,
-            "sub_questions": None,
-            "current_sub_question_index": 0,
-            "sub_results": None,
-        }
+        cache_key = self._answer_cache_key(question)
+        if self._answer_cache is not None and not bypass_cache:
+            cached = self._answer_cache.get(cache_key)
+            if cached is not None:
+                final_state = dict(cached)
+                final_state["messages"] = [
+                    HumanMessage(content=question),
+                    AIMessage(content=final_state["answer"]),
+                ]
+                if config is not None and self.checkpointer is not None:
+                    # Record the exchange in the thread's history as if the graph had run
+                    # (sub_results=None resets the reducer instead of appending)
+                    self.graph.update_state(
+                        config, {**final_state, "sub_results": None}, as_node="synthesize"
+                    )
+                return final_state
+        
+        with self._pooled_state() as initial_state, self._activated():
+            self._fill_initial_state(initial_state, question)
+            
+            # Run the graph workflow with optional config for checkpointing
+            # LangGraph will execute nodes in order based on edges
+            if config is not None:
+                final_state = self.graph.invoke(initial_state, config)
+            else:
+                final_state = self.graph.invoke(initial_state)
         
-        # Run the graph workflow with optional config for checkpointing
-        # LangGraph will execute nodes in order based on edges
-        if config is not None:
-            final_state = self.graph.invoke(initial_state, config)
-        else:
-            final_state = self.graph.invoke(initial_state)
+        # Cache successful answers (conversation messages are thread-specific).
+        # An answer aggregated from partially failed sub-questions is not cached.
+        succeeded = not final_state.get("error") and not any(
+            sr.get("error") for sr in final_state.get("sub_results") or []
+        )
+        if self._answer_cache is not None and final_state.get("answer") and succeeded:
+            self._answer_cache.set(
+                cache_key, {k: v for k, v in final_state.items() if k != "messages"}
+            )
         
         # Add assistant message with the answer to state for memory
         if final_state.get("answer"):
@@ -14,9 +14,10 @@ Usage:
 """
 
 import argparse
+import logging
+import os.path
 import sys
 import uuid
-from pathlib import Path
 
 from config import settings
 from src.data_loader import load_excel_files
@@ -108,7 +109,9 @@ def initialize_database() -> tuple[SchemaManager, DuckDBManager]:
     
     # Step 2: Load Excel files into DuckDB tables
     print(f"Loading Excel files from {settings.data_dir}...")
-    schemas = load_excel_files(db.con)
+    schemas, load_warnings = load_excel_files(db.con)
+    if load_warnings:
+        print(f"{len(load_warnings)} warning(s) while loading Excel files (see log output above)")
     
     # Step 3: Check if any tables were loaded
     if not schemas:
@@ -143,21 +146,17 @@ def initialize_system() -> tuple[SchemaManager, DuckDBManager]:
     Raises:
         FileNotFoundError: If schema.json or duckdb.db doesn't exist
     """
-    from pathlib import Path
-    
     print("Loading existing database (fast path)...")
     
     # Check if database file exists
-    db_path = Path(settings.duckdb_path)
-    if not db_path.exists():
+    if not os.path.exists(settings.duckdb_path):
         raise FileNotFoundError(
             f"Database not found at {settings.duckdb_path}. "
             f"Run with --database flag first to initialize the database."
         )
     
     # Check if schema file exists
-    schema_path = Path(settings.schema_path)
-    if not schema_path.exists():
+    if not os.path.exists(settings.schema_path):
         raise FileNotFoundError(
             f"Schema file not found at {settings.schema_path}. "
             f"Run with --database flag first to initialize the database."
@@ -176,45 +175,48 @@ def initialize_system() -> tuple[SchemaManager, DuckDBManager]:
 
 
 def display_result(result: dict, verbose: bool) -> None:
-    """Display the result from graph execution."""
+    """Display the result from graph execution (written to stdout in one call)."""
+    out: list[str] = []
     if verbose:
-        print("=" * 80)
-        print("DETAILED RESULTS")
-        print("=" * 80)
-        print(f"\nSchema Info:\n{result.get('schema_info', 'N/A')}\n")
+        out.append("=" * 80)
+        out.append("DETAILED RESULTS")
+        out.append("=" * 80)
+        out.append(f"\nSchema Info:\n{result.get('schema_info', 'N/A')}\n")
         
         # Show generated SQL query if available
         if result.get("query"):
-            print(f"Generated SQL Query:\n{result['query']}\n")
+            out.append(f"Generated SQL Query:\n{result['query']}\n")
         
         # Show query results if available
         if result.get("results") is not None:
-            print(f"Query Results ({len(result['results'])} rows):")
+            out.append(f"Query Results ({len(result['results'])} rows):")
             if result["results"]:
                 # Show first 10 rows for readability
-                for i, row in enumerate(result["results"][:10], 1):
-                    print(f"  Row {i}: {row}")
+                out.extend(f"  Row {i}: {row}" for i, row in enumerate(result["results"][:10], 1))
                 if len(result["results"]) > 10:
-                    print(f"  ... ({len(result['results']) - 10} more rows)")
+                    out.append(f"  ... ({len(result['results']) - 10} more rows)")
             else:
-                print("  (No results)")
-            print()
+                out.append("  (No results)")
+            out.append("")
         
         # Show errors if any occurred
         if result.get("error"):
-            print(f"Error: {result['error']}\n")
-        print("=" * 80)
-        print()
+            out.append(f"Error: {result['error']}\n")
+        out.append("=" * 80)
+        out.append("")
     
     # Display the final answer
     if result.get("answer"):
-        print("Answer:")
-        print("-" * 80)
-        print(result["answer"])
-        print("-" * 80)
+        out.append("Answer:")
+        out.append("-" * 80)
+        out.append(result["answer"])
+        out.append("-" * 80)
     elif result.get("error"):
         # If there's an error but no answer, show the error
-        print(f"Error: {result['error']}")
+        out.append(f"Error: {result['error']}")
+    
+    if out:
+        sys.stdout.write("\n".join(out) + "\n")
 
 
 def run_interactive_chat(args: argparse.Namespace, schema_manager: SchemaManager, db: DuckDBManager) -> None:
@@ -226,11 +228,14 @@ def run_interactive_chat(args: argparse.Namespace, schema_manager: SchemaManager
         schema_manager: SchemaManager instance
         db: DuckDBManager instance
     """
-    # Initialize memory manager
-    memory = MemoryManager(use_postgres=settings.use_postgres_memory)
+    # Memory, checkpointed graph and config are created on the first real question,
+    # so sessions that only run 'history' or 'exit' never set up a checkpointer
+    memory = None
+    graph = None
+    config = None
     
     # Generate thread ID if not provided
-    thread_id = args.thread or str(uuid.uuid4())[:8]
+    thread_id = args.thread or uuid.uuid4().hex[:8]
     user_id = args.user
     
     print(f"\n🎯 Interactive Chat Mode")
@@ -241,19 +246,6 @@ def run_interactive_chat(args: argparse.Namespace, schema_manager: SchemaManager
     print("   Type 'history' to see conversation history.")
     print("-" * 80)
     
-    # Register this thread
-    memory.register_thread(user_id, thread_id)
-    
-    # Get config for checkpointing
-    config = memory.get_config(user_id, thread_id)
-    
-    # Create the graph with checkpointer
-    graph = AgenticGraph(
-        schema_manager=schema_manager,
-        db=db,
-        checkpointer=memory.checkpointer
-    )
-    
     while True:
         try:
             # Get user input
@@ -268,12 +260,31 @@ def run_interactive_chat(args: argparse.Namespace, schema_manager: SchemaManager
             
             if question.lower() == "history":
                 # Show conversation history from state
-                threads = memory.list_user_threads(user_id)
                 print(f"\n📚 Your threads:")
+                if memory is None:
+                    print(f"   - {thread_id} (no messages yet)")
+                    continue
+                threads = memory.list_user_threads(user_id)
                 for t in threads:
                     print(f"   - {t.thread_id} (created: {t.created_at})")
                 continue
             
+            if graph is None:
+                # Initialize memory manager and register this thread
+                if memory is None:
+                    memory = MemoryManager(use_postgres=settings.use_postgres_memory)
+                memory.register_thread(user_id, thread_id)
+                
+                # Get config for checkpointing
+                config = memory.get_config(user_id, thread_id)
+                
+                # Create the graph with checkpointer
+                graph = AgenticGraph(
+                    schema_manager=schema_manager,
+                    db=db,
+                    checkpointer=memory.checkpointer
+                )
+            
             # Process the question with memory
             print("\n🤔 Processing...\n")
             result = graph.run(question, config)
@@ -296,7 +307,8 @@ def run_interactive_chat(args: argparse.Namespace, schema_manager: SchemaManager
                 traceback.print_exc()
     
     # Cleanup
-    memory.close()
+    if memory is not None:
+        memory.close()
 
 
 def main() -> None:
@@ -315,6 +327,10 @@ def main() -> None:
     # Parse command-line arguments
     args = parse_args()
     
+    # Show workflow progress (agentic.* loggers) and warnings as plain lines on stderr
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logging.getLogger("agentic").setLevel(logging.INFO)
+    
     # Validate arguments
     if not args.chat and not args.question:
         print("Error: Either --question or --chat is required.", file=sys.stderr)
@@ -8,9 +8,10 @@ namespacing and can be backed by PostgreSQL for production deployments.
 For development/testing, an in-memory checkpointer can be used.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 import os
 
 from langgraph.checkpoint.memory import MemorySaver
@@ -18,7 +19,29 @@ from langgraph.checkpoint.memory import MemorySaver
 from config import settings
 
 
-@dataclass
+@lru_cache(maxsize=None)
+def _postgres_backend() -> Optional[Tuple[Any, Any, Any]]:
+    """
+    Import the PostgreSQL checkpointer dependencies once per process.
+    
+    Resolved on first use rather than at module import, so the in-memory
+    path (and the single-question CLI) never pays for the psycopg import
+    chain; later MemoryManager instances reuse the cached outcome.
+    
+    Returns:
+        (PostgresSaver, ConnectionPool, dict_row), or None if
+        langgraph-checkpoint-postgres / psycopg_pool are not installed
+    """
+    try:
+        from langgraph.checkpoint.postgres import PostgresSaver
+        from psycopg.rows import dict_row
+        from psycopg_pool import ConnectionPool
+    except ImportError:
+        return None
+    return PostgresSaver, ConnectionPool, dict_row
+
+
+@dataclass(slots=True)
 class ChatThread:
     """
     Represents a conversation thread for a user.
@@ -61,7 +84,8 @@ class MemoryManager:
         """
         self.use_postgres = use_postgres
         self._checkpointer = None
-        self._threads_cache: Dict[str, List[ChatThread]] = {}
+        # Mapping: user_id -> {thread_id: ChatThread}, in registration order
+        self._threads_cache: Dict[str, Dict[str, ChatThread]] = {}
         
         # Initialize the appropriate checkpointer
         if use_postgres:
@@ -80,27 +104,37 @@ class MemoryManager:
         Requires POSTGRES_CONNECTION_STRING environment variable.
         Falls back to memory saver if not configured.
         """
+        backend = _postgres_backend()
+        if backend is None:
+            print("Warning: langgraph-checkpoint-postgres not installed. Using in-memory storage.")
+            self._init_memory_checkpointer()
+            return
+        PostgresSaver, ConnectionPool, dict_row = backend
+        
         try:
-            from langgraph.checkpoint.postgres import PostgresSaver
-            import psycopg
-            
             conn_string = os.getenv("POSTGRES_CONNECTION_STRING")
             if not conn_string:
                 print("Warning: POSTGRES_CONNECTION_STRING not set. Using in-memory storage.")
                 self._init_memory_checkpointer()
                 return
             
-            # Create connection pool for PostgreSQL
-            self._pg_connection = psycopg.connect(conn_string)
-            self._checkpointer = PostgresSaver(self._pg_connection)
+            # Create connection pool for PostgreSQL so concurrent graph runs
+            # don't serialize their checkpoint reads/writes on one connection
+            self._pg_pool = ConnectionPool(
+                conn_string,
+                min_size=2,
+                max_size=max(4, os.cpu_count() or 1),
+                kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+                open=True,
+            )
+            self._checkpointer = PostgresSaver(self._pg_pool)
             # Setup tables if they don't exist
             self._checkpointer.setup()
             
-        except ImportError:
-            print("Warning: langgraph-checkpoint-postgres not installed. Using in-memory storage.")
-            self._init_memory_checkpointer()
         except Exception as e:
             print(f"Warning: PostgreSQL connection failed ({e}). Using in-memory storage.")
+            self.close()
+            self._pg_pool = None
             self._init_memory_checkpointer()
     
     @property
@@ -108,10 +142,14 @@ class MemoryManager:
         """Get the underlying LangGraph checkpointer."""
         return self._checkpointer
     
-    def make_thread_id(self, user_id: str, thread_id: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def make_thread_id(user_id: str, thread_id: str) -> str:
         """
         Create a namespaced thread ID for user isolation.
         
+        Results are cached, so every turn of a chat reuses the same string.
+        
         Args:
             user_id: Unique user identifier
             thread_id: Thread name (can be reused across users)
@@ -148,7 +186,9 @@ class MemoryManager:
             thread_id: Thread identifier
             
         Returns:
-            Config dict with thread_id in configurable
+            Config dict with thread_id in configurable. A new dict is built
+            on every call (callers and LangGraph may add keys to it); only the
+            namespaced thread id is cached.
         """
         return {
             "configurable": {
@@ -166,21 +206,18 @@ class MemoryManager:
             title: Optional title for the thread
             
         Returns:
-            ChatThread object
+            ChatThread object (the existing one if the thread is already registered)
         """
-        thread = ChatThread(
-            thread_id=thread_id,
-            user_id=user_id,
-            title=title
-        )
-        
-        if user_id not in self._threads_cache:
-            self._threads_cache[user_id] = []
+        user_threads = self._threads_cache.setdefault(user_id, {})
         
         # Avoid duplicates
-        existing = [t for t in self._threads_cache[user_id] if t.thread_id == thread_id]
-        if not existing:
-            self._threads_cache[user_id].append(thread)
+        thread = user_threads.get(thread_id)
+        if thread is None:
+            thread = user_threads[thread_id] = ChatThread(
+                thread_id=thread_id,
+                user_id=user_id,
+                title=title
+            )
         
         return thread
     
@@ -194,9 +231,9 @@ class MemoryManager:
         Returns:
             List of ChatThread objects for this user
         """
-        return self._threads_cache.get(user_id, [])
+        return list(self._threads_cache.get(user_id, {}).values())
     
     def close(self) -> None:
         """Close any open connections."""
-        if hasattr(self, '_pg_connection') and self._pg_connection:
-            self._pg_connection.close()
+        if hasattr(self, '_pg_pool') and self._pg_pool:
+            self._pg_pool.close()
@@ -7,10 +7,50 @@ to generate accurate SQL queries, as they need to know what tables and columns
 are available in the database.
 """
 
-import json
+import hashlib
+import itertools
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, TypedDict, Optional, Set, Counter, Tuple
+from types import MappingProxyType
+from typing import AbstractSet, Any, Dict, List, Mapping, TypedDict, Optional, Tuple
+
+import orjson
+
+# Schema files larger than this are parsed incrementally when ijson is installed
+_STREAM_THRESHOLD_BYTES = 8 * 1024 * 1024
+
+
+def _read_schema_file(path_obj: Path) -> Dict[str, Any]:
+    """
+    Parse a schema file written by SchemaManager.save_to_file.
+    
+    Files above _STREAM_THRESHOLD_BYTES are decoded with ijson, one top-level
+    key at a time straight from the file, so the raw file contents are never
+    held in memory next to the parsed schema. Smaller files (or installs
+    without ijson) are read whole and decoded with orjson.
+    
+    Args:
+        path_obj: Path to the schema JSON file
+        
+    Returns:
+        Decoded top-level JSON object
+        
+    Raises:
+        ValueError: If the file is not valid JSON
+    """
+    if path_obj.stat().st_size > _STREAM_THRESHOLD_BYTES:
+        try:
+            import ijson
+        except ImportError:
+            ijson = None
+        if ijson is not None:
+            try:
+                with open(path_obj, 'rb') as f:
+                    return dict(ijson.kvitems(f, ""))
+            except ijson.JSONError as e:
+                raise ValueError(f"Invalid schema JSON: {e}") from e
+    return orjson.loads(path_obj.read_bytes())
 
 
 class ColumnInfo(TypedDict):
@@ -31,6 +71,11 @@ class SchemaManager:
     - Query schema information for specific tables
     """
 
+    # Shared empty registry every instance starts from. Most instances are filled by
+    # load_from_file(), which replaces it, so construction allocates no containers;
+    # update() swaps in a private dict before its first in-place write.
+    _EMPTY_SCHEMAS: Dict[str, List[ColumnInfo]] = {}
+
     def __init__(self) -> None:
         """
         Initialize an empty schema registry.
@@ -38,18 +83,35 @@ class SchemaManager:
         The internal _schemas dictionary will be populated when Excel files
         are loaded via the update() method.
         """
-        # Mapping: table_name -> List[ColumnInfo]
-        self._schemas: Dict[str, List[ColumnInfo]] = {}
-        # Set of column names that appear in multiple tables
-        self._shared_columns: Set[str] = set()
+        # Mapping: table_name -> List[ColumnInfo] (never mutate the shared empty default)
+        self._schemas: Dict[str, List[ColumnInfo]] = self._EMPTY_SCHEMAS
+        # Set of column names that appear in multiple tables (only ever reassigned)
+        self._shared_columns: AbstractSet[str] = frozenset()
+        # Inverted index: column name -> tables containing it
+        self._col_to_tables: Dict[str, List[str]] = {}
+        # (table_a, table_b, shared columns) for every pair of tables sharing columns,
+        # sorted by table pair, with table_a < table_b and sorted columns
+        self._relationships: List[Tuple[str, str, List[str]]] = []
+        # Rendered describe() output, relationship map and fingerprint; reset whenever the
+        # schemas change (_detect_relationships, load_from_file)
+        self._describe_cache: Optional[str] = None
+        self._rel_map_cache: Optional[str] = None
+        self._fingerprint_cache: Optional[str] = None
 
     def update(self, schemas: Dict[str, List[ColumnInfo]]) -> None:
         """
         Update the schema registry with new table schemas.
         
+        Relationships (and the cached describe() output) are only recomputed
+        when a table is added or its columns differ from the registered ones.
+        
         Args:
             schemas: Dictionary mapping table names to lists of column info objects
         """
+        if not any(self._schemas.get(table) != columns for table, columns in schemas.items()):
+            return
+        if self._schemas is self._EMPTY_SCHEMAS:
+            self._schemas = {}
         self._schemas.update(schemas)
         self._detect_relationships()
 
@@ -57,59 +119,65 @@ class SchemaManager:
         """
         Analyze schemas to identify columns shared across multiple tables.
         
-        This method builds a frequency map of all column names and identifies
-        those that appear in more than one table. These shared columns are
-        likely foreign keys or join keys.
+        This method indexes every column name to the tables holding it and
+        identifies those that appear in more than one table. These shared columns are
+        likely foreign keys or join keys. The pairwise table relationships
+        are derived from the same column -> tables index, so only shared
+        columns are visited instead of intersecting every pair of tables.
         """
+        self._describe_cache = None
+        self._rel_map_cache = None
+        self._fingerprint_cache = None
+        
         if not self._schemas:
-            self._shared_columns = set()
+            self._shared_columns = frozenset()
+            self._col_to_tables = {}
+            self._relationships = []
             return
 
-        # Count occurrences of each column name
-        column_counts = Counter()
-        for columns in self._schemas.values():
+        # Index the tables holding each column name (a single pass over all columns)
+        col_to_tables: Dict[str, List[str]] = defaultdict(list)
+        for table, columns in self._schemas.items():
             for col in columns:
-                column_counts[col['name']] += 1
+                col_to_tables[col['name']].append(table)
+        self._col_to_tables = dict(col_to_tables)
         
-        # Identify columns that appear in > 1 table
+        # Identify columns that appear in > 1 table; an index entry's length is
+        # the column's occurrence count, so no separate counter is needed
         self._shared_columns = {
-            col for col, count in column_counts.items() 
-            if count > 1
+            col for col, tables in self._col_to_tables.items()
+            if len(tables) > 1
         }
+        
+        # Group shared columns by the table pairs that hold them
+        pairs: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+        for col in self._shared_columns:
+            for table_a, table_b in itertools.combinations(sorted(set(self._col_to_tables[col])), 2):
+                pairs[(table_a, table_b)].append(col)
+        self._relationships = [
+            (table_a, table_b, sorted(cols))
+            for (table_a, table_b), cols in sorted(pairs.items())
+        ]
 
     def _build_relationship_map(self) -> str:
         """
         Generate a text description of relationships between tables.
         
-        This method iterates through all pairs of tables and finds shared columns,
-        creating a clear "map" for the agent to understand join possibilities.
+        This method lists every pair of tables that shares columns (computed
+        by _detect_relationships), creating a clear "map" for the agent to
+        understand join possibilities.
+        The map is cached until the schemas change.
         """
-        if not self._schemas or len(self._schemas) < 2:
-            return ""
+        if self._rel_map_cache is None:
+            self._rel_map_cache = self._render_relationship_map()
+        return self._rel_map_cache
 
-        table_names = sorted(list(self._schemas.keys()))
-        relationships: List[str] = []
-        
-        # Iterate over unique pairs of tables
-        for i in range(len(table_names)):
-            for j in range(i + 1, len(table_names)):
-                table_a = table_names[i]
-                table_b = table_names[j]
-                
-                # Get column sets for both tables
-                cols_a = {c['name'] for c in self._schemas[table_a]}
-                cols_b = {c['name'] for c in self._schemas[table_b]}
-                
-                # Find intersection
-                common = cols_a.intersection(cols_b)
-                
-                # Filter out common false positives if necessary (e.g. 'is_test')
-                # For now we keep it simple and show all shared keys
-                valid_links = sorted(list(common))
-                
-                if valid_links:
-                    links_str = ", ".join(valid_links)
-                    relationships.append(f"- {table_a} and {table_b} are linked by: {links_str}")
+    def _render_relationship_map(self) -> str:
+        """Render the relationship map text (see _build_relationship_map)."""
+        relationships = [
+            f"- {table_a} and {table_b} are linked by: {', '.join(cols)}"
+            for table_a, table_b, cols in self._relationships
+        ]
 
         if not relationships:
             return ""
@@ -134,8 +202,12 @@ class SchemaManager:
             String representation of all tables and their columns.
             
         Note:
-            Returns "No tables loaded." if the registry is empty.
+            Returns "No tables loaded." if the registry is empty. The summary
+            is cached until the schemas change.
         """
+        if self._describe_cache is not None:
+            return self._describe_cache
+        
         if not self._schemas:
             return "No tables loaded."
         
@@ -176,16 +248,29 @@ class SchemaManager:
         # Append relationship map
         rel_map = self._build_relationship_map()
         
-        return schema_str + rel_map
+        self._describe_cache = schema_str + rel_map
+        return self._describe_cache
+
+    def fingerprint(self) -> str:
+        """
+        Short, stable hash of describe(), used to key schema-dependent caches.
+        
+        Returns:
+            16-character hex digest, cached until the schemas change
+        """
+        if self._fingerprint_cache is None:
+            self._fingerprint_cache = hashlib.blake2b(self.describe().encode(), digest_size=8).hexdigest()
+        return self._fingerprint_cache
 
-    def get(self) -> Dict[str, List[ColumnInfo]]:
+    def get(self) -> Mapping[str, List[ColumnInfo]]:
         """
         Get the full schema dictionary.
         
         Returns:
-            Copy of the internal schema dictionary mapping table names to lists of ColumnInfo
+            Read-only view of the internal schema dictionary mapping table names
+            to lists of ColumnInfo (reflects later updates; copy with dict() to snapshot)
         """
-        return dict(self._schemas)
+        return MappingProxyType(self._schemas)
     
     def get_table_names(self) -> List[str]:
         """
@@ -221,25 +306,11 @@ class SchemaManager:
         Args:
             path: Path to the output JSON file
         """
-        # Build relationship list from current schemas
-        relationships = []
-        table_names = sorted(list(self._schemas.keys()))
-        
-        for i in range(len(table_names)):
-            for j in range(i + 1, len(table_names)):
-                table_a = table_names[i]
-                table_b = table_names[j]
-                
-                cols_a = {c['name'] for c in self._schemas[table_a]}
-                cols_b = {c['name'] for c in self._schemas[table_b]}
-                common = sorted(list(cols_a.intersection(cols_b)))
-                
-                if common:
-                    relationships.append({
-                        "table_a": table_a,
-                        "table_b": table_b,
-                        "shared_columns": common
-                    })
+        # Relationship list computed by _detect_relationships
+        relationships = [
+            {"table_a": table_a, "table_b": table_b, "shared_columns": cols}
+            for table_a, table_b, cols in self._relationships
+        ]
         
         # Build output structure
         output = {
@@ -252,8 +323,7 @@ class SchemaManager:
         # Write to file
         path_obj = Path(path)
         path_obj.parent.mkdir(parents=True, exist_ok=True)
-        with open(path_obj, 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=2, ensure_ascii=False)
+        path_obj.write_bytes(orjson.dumps(output, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         
         print(f"Schema exported to {path}")
 
@@ -273,19 +343,35 @@ class SchemaManager:
             return False
         
         try:
-            with open(path_obj, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Restore schemas
-            self._schemas = data.get("tables", {})
+            data = _read_schema_file(path_obj)
+            schemas = data.get("tables", {})
             
-            # Restore shared columns
-            self._shared_columns = set(data.get("shared_columns", []))
+            # Restore shared columns and relationships as persisted by save_to_file,
+            # rather than re-deriving them from the tables. Everything is parsed
+            # before any field is replaced, so a malformed file leaves the
+            # current schema untouched.
+            if "relationships" in data and "shared_columns" in data:
+                shared_columns = set(data["shared_columns"])
+                relationships = [
+                    (r["table_a"], r["table_b"], r["shared_columns"])
+                    for r in data["relationships"]
+                ]
+                self._schemas = schemas
+                self._shared_columns = shared_columns
+                self._relationships = relationships
+                # Only _detect_relationships reads the index; it rebuilds it on update()
+                self._col_to_tables = {}
+                self._describe_cache = None
+                self._rel_map_cache = None
+                self._fingerprint_cache = None
+            else:
+                self._schemas = schemas
+                self._detect_relationships()
             
             print(f"Schema loaded from {path} (generated at: {data.get('generated_at', 'unknown')})")
             return True
             
-        except (json.JSONDecodeError, KeyError) as e:
+        except (ValueError, KeyError) as e:
             print(f"Warning: Failed to load schema from {path}: {e}")
             return False
 
@@ -0,0 +1,117 @@
+"""
+Shared fixtures for the test suite.
+
+The agents never reach Ollama here: FakeChatModel answers every prompt from
+rules keyed on the prompt text, and the graph's agents are pointed at it.
+"""
+
+import dataclasses
+import os
+import sys
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple
+
+import pytest
+
+# Keep a developer's .env out of the tests, never write the LLM response cache,
+# and import modules from the repo root
+os.environ["SKIP_DOTENV"] = "1"
+os.environ["LLM_CACHE_PATH"] = ""
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from langchain_core.language_models.chat_models import BaseChatModel  # noqa: E402
+from langchain_core.messages import AIMessage, BaseMessage  # noqa: E402
+from langchain_core.outputs import ChatGeneration, ChatResult  # noqa: E402
+
+import src.graph as graph_module  # noqa: E402
+from src.db_manager import DuckDBManager  # noqa: E402
+from src.graph import AgenticGraph  # noqa: E402
+from src.schema_manager import SchemaManager  # noqa: E402
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat model answering each prompt with the reply of the first matching rule.
+    
+    Rules are (substring, reply) pairs matched against the whole conversation;
+    a reply may be a callable taking the message list. Every call is recorded
+    in `calls` as the text of its last message.
+    """
+
+    rules: List[Any]
+    calls: List[str] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-rules"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        text = "\n".join(str(m.content) for m in messages)
+        self.calls.append(str(messages[-1].content))
+        for needle, reply in self.rules:
+            if needle in text:
+                content = reply(messages) if callable(reply) else reply
+                return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+        raise AssertionError(f"No fake reply for prompt: {messages[-1].content[:200]}")
+
+
+# Prompt markers of each agent call (see src/agents.py)
+ANALYSIS = "Does this question require querying the database?"
+COMPLEXITY = "should be decomposed into simpler sub-questions"
+CODING = "Generate a SQL query to answer this question."
+CORRECTION = "=== CORRECTION REQUIRED ==="
+SYNTHESIS = "SQL query executed:"
+AGGREGATION = "ORIGINAL USER QUESTION:"
+
+
+SALES_SCHEMA = {
+    "sales": [
+        {"name": "market", "type": "STRING", "description": "Market code"},
+        {"name": "units", "type": "INTEGER", "description": "Units sold"},
+    ],
+}
+
+
+@pytest.fixture
+def db() -> DuckDBManager:
+    """In-memory database with a small sales table and its load hash recorded."""
+    manager = DuckDBManager(":memory:")
+    manager.con.execute("CREATE TABLE sales (market VARCHAR, units INTEGER)")
+    manager.con.execute("INSERT INTO sales VALUES ('US', 10), ('US', 5), ('FR', 7)")
+    manager.con.execute("CREATE TABLE __load_hashes (table_name VARCHAR PRIMARY KEY, hash VARCHAR)")
+    manager.con.execute("INSERT INTO __load_hashes VALUES ('sales', 'v1')")
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def schema_manager() -> SchemaManager:
+    """Schema manager describing the sales table."""
+    manager = SchemaManager()
+    manager.update(SALES_SCHEMA)
+    return manager
+
+
+@pytest.fixture
+def cache_dirs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Point the graph's answer and sub-question caches at a per-test directory."""
+    monkeypatch.setattr(graph_module, "settings", dataclasses.replace(
+        graph_module.settings,
+        answer_cache_dir=str(tmp_path / "answers"),
+        subquery_cache_dir=str(tmp_path / "subqueries"),
+    ))
+    return tmp_path
+
+
+@pytest.fixture
+def make_graph(
+    schema_manager: SchemaManager, db: DuckDBManager, cache_dirs: Path
+) -> Callable[..., AgenticGraph]:
+    """Build (AgenticGraph, FakeChatModel) with the graph's agents answering from the fake."""
+    def _make(rules: List[Any], checkpointer: Any = None) -> Tuple[AgenticGraph, FakeChatModel]:
+        graph = AgenticGraph(schema_manager, db, checkpointer=checkpointer)
+        llm = FakeChatModel(rules=rules, calls=[])
+        graph.supervisor._get_llm = lambda: llm
+        graph.coder._get_llm = lambda: llm
+        return graph, llm
+    return _make
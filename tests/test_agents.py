@@ -0,0 +1,26 @@
+"""Tests for the agents' lazily built ChatOllama clients."""
+
+import asyncio
+
+from src.agents import SupervisorAgent, build_supervisor_config
+
+
+def test_llm_client_is_reused_outside_event_loops():
+    agent = SupervisorAgent(build_supervisor_config())
+    
+    assert agent._get_llm() is agent._get_llm()
+
+
+def test_each_event_loop_gets_its_own_llm_client():
+    agent = SupervisorAgent(build_supervisor_config())
+    
+    async def clients():
+        return agent._get_llm(), agent._get_llm()
+    
+    first_a, first_b = asyncio.run(clients())
+    second, _ = asyncio.run(clients())
+    
+    # Stable within a loop, distinct across loops and from the sync client
+    assert first_a is first_b
+    assert second is not first_a
+    assert agent._get_llm() not in (first_a, second)
@@ -0,0 +1,131 @@
+"""Invalidation of the answer and sub-question caches (schema, data and failures)."""
+
+import json
+
+from tests.conftest import AGGREGATION, ANALYSIS, CODING, COMPLEXITY
+
+TOTAL_SQL = "SELECT SUM(units) AS total FROM sales"
+BY_MARKET_SQL = "SELECT market, SUM(units) AS total FROM sales GROUP BY market ORDER BY market"
+
+DECOMPOSITION = json.dumps({
+    "is_complex": True,
+    "sub_questions": [
+        {"id": 1, "text": "What is the total of units sold?", "deps": []},
+        {"id": 2, "text": "What are the units sold per market?", "deps": []},
+    ],
+    "reasoning": "two metrics",
+})
+
+QUESTION = "Give me the total units sold and also compare the units sold per market"
+
+
+def _write_sql(messages):
+    return TOTAL_SQL if "total of units" in messages[-1].content else BY_MARKET_SQL
+
+
+def _decomposed_rules(aggregate="22 units in total: FR 7, US 15."):
+    return [
+        (ANALYSIS, "NEED_QUERY"),
+        (COMPLEXITY, DECOMPOSITION),
+        (AGGREGATION, aggregate),
+        (CODING, _write_sql),
+    ]
+
+
+def _reload_sales(db, rows, version):
+    """Replace the sales rows and record a new load hash, as the loader would."""
+    db.con.execute("DELETE FROM sales")
+    db.con.executemany("INSERT INTO sales VALUES (?, ?)", rows)
+    db.con.execute("UPDATE __load_hashes SET hash = ? WHERE table_name = 'sales'", [version])
+
+
+def test_repeated_question_is_answered_from_the_cache(make_graph):
+    graph, llm = make_graph(_decomposed_rules())
+    
+    first = graph.run(QUESTION)
+    calls = len(llm.calls)
+    second = graph.run(QUESTION)
+    
+    assert second["answer"] == first["answer"]
+    assert len(llm.calls) == calls
+
+
+def test_answer_cache_key_follows_schema_data_and_models(make_graph, db):
+    graph, _ = make_graph([])
+    key = graph._answer_cache_key(QUESTION)
+    
+    assert graph._answer_cache_key(QUESTION) == key
+    assert graph._answer_cache_key(QUESTION + "?") != key
+    
+    _reload_sales(db, [("US", 1)], "v2")
+    assert graph._answer_cache_key(QUESTION) == key  # until the graph is refreshed
+    graph.refresh_schema()
+    reloaded_key = graph._answer_cache_key(QUESTION)
+    assert reloaded_key != key
+    
+    graph._model_signature = "other-models"
+    assert graph._answer_cache_key(QUESTION) not in (key, reloaded_key)
+
+
+def test_data_reload_invalidates_cached_answers(make_graph, db):
+    graph, llm = make_graph(_decomposed_rules())
+    graph.run(QUESTION)
+    
+    _reload_sales(db, [("US", 1), ("DE", 2)], "v2")
+    graph.refresh_schema()
+    calls = len(llm.calls)
+    result = graph.run(QUESTION)
+    
+    assert len(llm.calls) > calls
+    sub_results = sorted(result["sub_results"], key=lambda sr: sr["id"])
+    assert sub_results[0]["results"] == [{"total": 3}]
+
+
+def test_sub_question_results_are_reused_until_the_data_changes(make_graph, db):
+    graph, llm = make_graph(_decomposed_rules())
+    graph.run(QUESTION)
+    
+    # A new question with the same sub-questions skips their coding calls
+    llm.calls.clear()
+    graph.run(QUESTION + " please", bypass_cache=True)
+    assert not any(CODING in call for call in llm.calls)
+    
+    _reload_sales(db, [("US", 1)], "v2")
+    graph.refresh_schema()
+    llm.calls.clear()
+    result = graph.run(QUESTION + " please", bypass_cache=True)
+    
+    assert sum(CODING in call for call in llm.calls) == 2
+    sub_results = sorted(result["sub_results"], key=lambda sr: sr["id"])
+    assert sub_results[0]["results"] == [{"total": 1}]
+
+
+def test_schema_change_invalidates_sub_question_results(make_graph, schema_manager):
+    graph, llm = make_graph(_decomposed_rules())
+    graph.run(QUESTION)
+    
+    schema_manager.update({**schema_manager.get(), "returns": [{"name": "units", "type": "INTEGER", "description": None}]})
+    graph.refresh_schema()
+    llm.calls.clear()
+    graph.run(QUESTION, bypass_cache=True)
+    
+    assert sum(CODING in call for call in llm.calls) == 2
+
+
+def test_answers_from_failed_sub_questions_are_not_cached(make_graph):
+    def write_sql(messages):
+        return TOTAL_SQL if "total of units" in messages[-1].content else "SELECT nope FROM missing"
+    
+    graph, llm = make_graph([
+        (ANALYSIS, "NEED_QUERY"),
+        (COMPLEXITY, DECOMPOSITION),
+        (AGGREGATION, "Only the total is known: 22."),
+        (CODING, write_sql),
+    ])
+    
+    first = graph.run(QUESTION)
+    assert any(sr["error"] for sr in first["sub_results"])
+    
+    calls = len(llm.calls)
+    graph.run(QUESTION)
+    assert len(llm.calls) > calls
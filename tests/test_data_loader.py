@@ -0,0 +1,165 @@
+"""
+Excel loading tests.
+
+Expected tables are the output of the original pandas.read_excel + TRY_CAST
+loader on the same workbook, so both the openpyxl fallback and DuckDB's
+native reader are held to the behaviour the project started from.
+"""
+
+import dataclasses
+import datetime
+import os
+from pathlib import Path
+
+import duckdb
+import openpyxl
+import pytest
+
+import src.data_loader as data_loader
+from src.db_manager import DuckDBManager
+
+
+def _native_reader_available() -> bool:
+    try:
+        duckdb.connect().execute("LOAD excel")
+        return True
+    except duckdb.Error:
+        return False
+
+
+READERS = [
+    "pandas",
+    pytest.param("native", marks=pytest.mark.skipif(
+        not _native_reader_available(), reason="DuckDB excel extension not installed"
+    )),
+]
+
+# Baseline loader output for write_shop_workbook()
+BASELINE_TYPES = [
+    ("id", "VARCHAR"),
+    ("market", "VARCHAR"),
+    ("units", "INTEGER"),
+    ("price", "DOUBLE"),
+    ("day", "DATE"),
+    ("note", "VARCHAR"),
+]
+BASELINE_ROWS = [
+    ("1", "US", 10, 2.5, datetime.date(2024, 1, 5), "first"),
+    ("2", "FR", None, 3.0, datetime.date(2024, 2, 1), None),
+    ("3", "DE", 7, None, None, "last"),
+]
+BASELINE_COLUMNS = [
+    {"name": "id", "type": "STRING", "description": None},
+    {"name": "market", "type": "STRING", "description": "Market code"},
+    {"name": "units", "type": "INTEGER", "description": "Units sold"},
+    {"name": "price", "type": "FLOAT", "description": None},
+    {"name": "day", "type": "DATE", "description": "Order day"},
+    {"name": "note", "type": "STRING", "description": None},
+]
+
+
+def write_shop_workbook(path: Path, blank_row: bool = False, units=(10, "x3", 7)) -> None:
+    """Write a workbook with an 'orders' data sheet, its metadata sheet and an empty sheet."""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "orders"
+    ws.append(["id", "market", "units", "price", "day", "note"])
+    ws.append([1, "US", units[0], 2.5, datetime.datetime(2024, 1, 5), "first"])
+    ws.append([2, "FR", units[1], 3, datetime.datetime(2024, 2, 1), None])
+    if blank_row:
+        ws.append([None] * 6)
+    ws.append([3, "DE", units[2], None, None, "last"])
+    
+    meta = wb.create_sheet("orders_")
+    meta.append(["Field Name", "Type", "Description"])
+    meta.append(["market", "STRING", "Market code"])
+    meta.append(["units", "INTEGER", "Units sold"])
+    meta.append(["price", "FLOAT", None])
+    meta.append(["day", "DATE", "Order day"])
+    
+    wb.create_sheet("empty")
+    wb.save(path)
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch, request):
+    """Data directory the loader reads from, using the reader given by the test parameter."""
+    directory = tmp_path / "data"
+    directory.mkdir()
+    monkeypatch.setattr(data_loader, "settings", dataclasses.replace(
+        data_loader.settings, data_dir=str(directory), schema_path=str(tmp_path / "schema.json"),
+    ))
+    if getattr(request, "param", "pandas") == "pandas":
+        monkeypatch.setattr(data_loader, "_load_excel_extension", lambda con, warnings: False)
+    return directory
+
+
+@pytest.fixture
+def db():
+    manager = DuckDBManager(":memory:")
+    yield manager
+    manager.close()
+
+
+@pytest.mark.parametrize("data_dir", READERS, indirect=True)
+def test_load_matches_baseline_loader(data_dir, db):
+    write_shop_workbook(data_dir / "shop.xlsx")
+    
+    schema, warnings = data_loader.load_excel_files(db.con)
+    
+    assert schema == {"shop_orders": BASELINE_COLUMNS}
+    assert db.con.execute("SELECT column_name, data_type FROM information_schema.columns "
+                          "WHERE table_name = 'shop_orders' ORDER BY ordinal_position").fetchall() == BASELINE_TYPES
+    assert db.con.execute("SELECT * FROM shop_orders ORDER BY id").fetchall() == BASELINE_ROWS
+    assert warnings == ["Sheet 'empty' in 'shop.xlsx' is empty, skipping"]
+
+
+@pytest.mark.parametrize("data_dir", READERS, indirect=True)
+def test_blank_rows_are_skipped_without_truncating_the_sheet(data_dir, db):
+    write_shop_workbook(data_dir / "shop.xlsx", blank_row=True)
+    
+    data_loader.load_excel_files(db.con)
+    
+    rows = db.con.execute("SELECT market FROM shop_orders ORDER BY id").fetchall()
+    assert rows == [("US",), ("FR",), ("DE",)]
+
+
+@pytest.mark.parametrize("data_dir", READERS, indirect=True)
+def test_untyped_text_is_kept_verbatim(data_dir, db):
+    # Without metadata, "units" is VARCHAR and mixed values must all survive
+    write_shop_workbook(data_dir / "shop.xlsx")
+    wb = openpyxl.load_workbook(data_dir / "shop.xlsx")
+    del wb["orders_"]
+    wb.save(data_dir / "shop.xlsx")
+    
+    data_loader.load_excel_files(db.con)
+    
+    assert db.con.execute("SELECT units FROM shop_orders ORDER BY id").fetchall() == [("10",), ("x3",), ("7",)]
+
+
+def test_reload_of_unchanged_workbook_keeps_the_data_version(data_dir, db):
+    workbook = data_dir / "shop.xlsx"
+    write_shop_workbook(workbook)
+    data_loader.load_excel_files(db.con)
+    version = db.data_version()
+    
+    # Same content under a new mtime: re-read, hashed, and left in place
+    os.utime(workbook, (1, 1))
+    schema, _ = data_loader.load_excel_files(db.con)
+    
+    assert schema == {"shop_orders": BASELINE_COLUMNS}
+    assert version and db.data_version() == version
+
+
+def test_changed_workbook_moves_the_data_version(data_dir, db):
+    workbook = data_dir / "shop.xlsx"
+    write_shop_workbook(workbook)
+    data_loader.load_excel_files(db.con)
+    version = db.data_version()
+    
+    write_shop_workbook(workbook, units=(11, 4, 7))
+    os.utime(workbook, (2, 2))
+    data_loader.load_excel_files(db.con)
+    
+    assert db.data_version() != version
+    assert db.con.execute("SELECT units FROM shop_orders ORDER BY id").fetchall() == [(11,), (4,), (7,)]
@@ -0,0 +1,144 @@
+"""End-to-end runs of AgenticGraph against a fake chat model and an in-memory DuckDB."""
+
+import asyncio
+import json
+
+from langgraph.checkpoint.memory import MemorySaver
+
+from tests.conftest import AGGREGATION, ANALYSIS, CODING, COMPLEXITY, CORRECTION, SYNTHESIS
+
+TOTAL_SQL = "SELECT SUM(units) AS total FROM sales"
+BY_MARKET_SQL = "SELECT market, SUM(units) AS total FROM sales GROUP BY market ORDER BY market"
+
+NOT_DECOMPOSED = json.dumps({"is_complex": False, "sub_questions": [], "reasoning": "one metric"})
+
+
+def test_no_query_answer_comes_from_the_supervisor(make_graph):
+    graph, llm = make_graph([(ANALYSIS, "NO_QUERY Hello! Ask me about sales.")])
+    
+    result = graph.run("hello")
+    
+    assert result["answer"] == "NO_QUERY Hello! Ask me about sales."
+    assert result["query"] is None
+    # Conversational turns cost a single LLM call (no complexity detection)
+    assert len(llm.calls) == 1
+
+
+def test_simple_question_runs_the_prepared_query(make_graph):
+    graph, llm = make_graph([
+        (ANALYSIS, "NEED_QUERY"),
+        (COMPLEXITY, NOT_DECOMPOSED),
+        (CODING, f"```sql\n{BY_MARKET_SQL}\n```"),
+        (SYNTHESIS, "FR sold 7 units and US sold 15."),
+    ])
+    
+    result = graph.run("How many units were sold per market over the whole period?")
+    
+    assert result["error"] is None
+    assert result["query"] == BY_MARKET_SQL
+    assert result["query_is_valid"] is True
+    assert result["results"] == [{"market": "FR", "total": 7}, {"market": "US", "total": 15}]
+    assert result["answer"] == "FR sold 7 units and US sold 15."
+
+
+def test_single_value_result_is_answered_without_synthesis(make_graph):
+    graph, llm = make_graph([
+        (ANALYSIS, "NEED_QUERY"),
+        (CODING, TOTAL_SQL),
+    ])
+    
+    result = graph.run("Total units sold?")
+    
+    assert result["results"] == [{"total": 22}]
+    assert "22" in result["answer"]
+    assert not any(SYNTHESIS in call for call in llm.calls)
+
+
+def test_invalid_query_is_repaired_in_the_same_conversation(make_graph):
+    graph, llm = make_graph([
+        (ANALYSIS, "NEED_QUERY"),
+        (CORRECTION, TOTAL_SQL),
+        (CODING, "SELECT SUM(quantity) AS total FROM sales"),
+    ])
+    
+    result = graph.run("Total units sold?")
+    
+    assert result["query"] == TOTAL_SQL
+    assert result["retries"] == 1
+    assert result["results"] == [{"total": 22}]
+    assert any("quantity" in call for call in llm.calls if CORRECTION in call)
+
+
+def test_validator_failure_falls_back_to_plain_execution(make_graph, monkeypatch):
+    graph, llm = make_graph([
+        (ANALYSIS, "NEED_QUERY"),
+        (CODING, TOTAL_SQL),
+    ])
+    
+    def broken_prepare(name, sql):
+        raise RuntimeError("validator down")
+    
+    monkeypatch.setattr(graph.db, "prepare", broken_prepare)
+    
+    result = graph.run("Total units sold?")
+    
+    assert result["error"] is None
+    assert result["results"] == [{"total": 22}]
+
+
+def test_decomposed_question_aggregates_sub_results(make_graph):
+    decomposition = json.dumps({
+        "is_complex": True,
+        "sub_questions": [
+            {"id": 1, "text": "What is the total of units sold?", "deps": []},
+            {"id": 2, "text": "What are the units sold per market?", "deps": []},
+        ],
+        "reasoning": "two metrics",
+    })
+    
+    def write_sql(messages):
+        return TOTAL_SQL if "total of units" in messages[-1].content else BY_MARKET_SQL
+    
+    graph, llm = make_graph([
+        (ANALYSIS, "NEED_QUERY"),
+        (COMPLEXITY, decomposition),
+        (AGGREGATION, "22 units in total: FR 7, US 15."),
+        (CODING, write_sql),
+    ])
+    
+    result = graph.run("Give me the total units sold and also compare the units sold per market")
+    
+    assert result["is_complex"] is True
+    assert result["answer"] == "22 units in total: FR 7, US 15."
+    sub_results = sorted(result["sub_results"], key=lambda sr: sr["id"])
+    assert [sr["error"] for sr in sub_results] == [None, None]
+    assert sub_results[0]["results"] == [{"total": 22}]
+    assert sub_results[1]["results"] == [{"market": "FR", "total": 7}, {"market": "US", "total": 15}]
+
+
+def test_checkpointed_thread_keeps_the_conversation(make_graph):
+    graph, llm = make_graph([(ANALYSIS, "NO_QUERY Hi!")], checkpointer=MemorySaver())
+    config = {"configurable": {"thread_id": "user__chat"}}
+    
+    graph.run("hello", config)
+    result = graph.run("hello again", config, bypass_cache=True)
+    
+    history = [m.content for m in graph.graph.get_state(config).values["messages"]]
+    assert history[:1] == ["hello"] and history[-1] == "hello again"
+    assert result["messages"][-1].content == "NO_QUERY Hi!"
+
+
+def test_arun_streams_node_updates(make_graph):
+    graph, llm = make_graph([
+        (ANALYSIS, "NEED_QUERY"),
+        (CODING, TOTAL_SQL),
+    ])
+    
+    async def collect():
+        return [event async for event in graph.arun("Total units sold?")]
+    
+    events = asyncio.run(collect())
+    
+    nodes = [node for event in events for node in event]
+    assert nodes[0] == "supervisor"
+    assert "22" in events[-1]["synthesize"]["answer"]
@@ -0,0 +1,59 @@
+"""Tests for SchemaManager relationship detection and schema file round trips."""
+
+import json
+
+from src.schema_manager import SchemaManager
+
+SCHEMAS = {
+    "orders": [
+        {"name": "order_id", "type": "INTEGER", "description": None},
+        {"name": "market", "type": "STRING", "description": "Market code"},
+    ],
+    "returns": [
+        {"name": "order_id", "type": "INTEGER", "description": None},
+        {"name": "reason", "type": "STRING", "description": None},
+    ],
+}
+
+
+def _manager() -> SchemaManager:
+    manager = SchemaManager()
+    manager.update(SCHEMAS)
+    return manager
+
+
+def test_shared_columns_become_relationships():
+    manager = _manager()
+    
+    assert manager._shared_columns == {"order_id"}
+    assert manager._relationships == [("orders", "returns", ["order_id"])]
+
+
+def test_schema_file_round_trip(tmp_path):
+    path = tmp_path / "schema.json"
+    original = _manager()
+    original.save_to_file(str(path))
+    
+    loaded = SchemaManager()
+    
+    assert loaded.load_from_file(str(path))
+    assert dict(loaded.get()) == SCHEMAS
+    assert loaded._relationships == original._relationships
+    assert loaded.describe() == original.describe()
+    assert loaded.fingerprint() == original.fingerprint()
+
+
+def test_malformed_schema_file_leaves_the_current_schema(tmp_path):
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps({
+        "tables": {"other": [{"name": "x", "type": "INTEGER", "description": None}]},
+        "relationships": [{"table_a": "other"}],
+        "shared_columns": [],
+    }))
+    manager = _manager()
+    description = manager.describe()
+    
+    assert not manager.load_from_file(str(path))
+    assert dict(manager.get()) == SCHEMAS
+    assert manager._relationships == [("orders", "returns", ["order_id"])]
+    assert manager.describe() == description